@@ -29,7 +29,7 @@ def main():
         """)
     
     with col2:
-        st.image("https://via.placeholder.com/150", width=150)
+        st.image("assets/logo.svg", width=150)
     
     st.markdown("---")
     
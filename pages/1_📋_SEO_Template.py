@@ -3,11 +3,15 @@ import yaml
 import os
 
 
-def load_templates():
-    """Load SEO templates from config."""
-    config_path = 'config/seo_templates.yaml'
+# Prefer the libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@st.cache_data
+def load_templates(config_path: str = 'config/seo_templates.yaml'):
+    """Load SEO templates from config (parsed once, cached across reruns)."""
     with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YAML_LOADER)
     return config['templates']
 
 
@@ -1,11 +1,16 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
 from src.market_matcher import MarketMatcher
 from src.power_calculator import PowerCalculator
 from src.data_generator import StochasticSEOGenerator
 import yaml
+import hashlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Only for the figure return annotations; plotly itself is imported lazily
+    import plotly.graph_objects as go
 
 st.set_page_config(page_title="Experiment Design", layout="wide")
 
@@ -18,8 +23,6 @@ if 'pre_period_data' not in st.session_state:
     st.session_state['pre_period_data'] = None
 if 'synthetic_weights' not in st.session_state:
     st.session_state['synthetic_weights'] = None
-if 'control_markets_data_cached' not in st.session_state:
-    st.session_state['control_markets_data_cached'] = None
 
 st.title("🎯 Experiment Design & Power Calculation")
 
@@ -35,28 +38,156 @@ st.markdown(f"**Template:** {template['name']}")
 st.markdown(f"**Primary Metric:** {template['primary_metric']}")
 st.markdown("---")
 
-# Initialize tools
-matcher = MarketMatcher()
-power_calc = PowerCalculator()
+# Initialize tools (shared across reruns)
+@st.cache_resource
+def get_matcher() -> MarketMatcher:
+    return MarketMatcher()
+
+
+@st.cache_resource
+def get_power_calculator() -> PowerCalculator:
+    return PowerCalculator()
+
+
+matcher = get_matcher()
+power_calc = get_power_calculator()
+
+POWER_CURVE_DURATIONS = np.arange(7, 91, 7)
+
+
+@st.cache_data(show_spinner=False)
+def cached_matches(test_data: np.ndarray, control_matrix: np.ndarray, controls_normalized: np.ndarray, control_names: tuple, top_k: int = 5) -> pd.DataFrame:
+    """Rank control candidates for a test series (memoized on inputs)."""
+    return get_matcher().rank_controls(
+        test_data,
+        control_matrix,
+        list(control_names),
+        top_k=top_k,
+        controls_normalized=controls_normalized
+    )
+
+
+@st.cache_data(show_spinner=False)
+def cached_sample_characteristics(pre_period_data: np.ndarray) -> dict:
+    """Baseline mean/std/CV of a pre-period series (memoized on inputs)."""
+    return get_power_calculator().estimate_sample_characteristics(pre_period_data)
+
+
+@st.cache_data(show_spinner=False)
+def cached_required_duration(baseline_mean: float, baseline_std: float, mde_pct: float, alpha: float, power: float) -> dict:
+    """Required duration for the given design (memoized on inputs)."""
+    return get_power_calculator().calculate_required_duration(
+        baseline_mean=baseline_mean,
+        baseline_std=baseline_std,
+        mde_pct=mde_pct,
+        alpha=alpha,
+        power=power
+    )
+
+
+@st.cache_data(show_spinner=False)
+def cached_achieved_power(baseline_mean: float, baseline_std: float, mde_pct: float, duration_days: int, alpha: float) -> dict:
+    """Achieved power at one duration (memoized on inputs)."""
+    return get_power_calculator().calculate_achieved_power(
+        baseline_mean=baseline_mean,
+        baseline_std=baseline_std,
+        mde_pct=mde_pct,
+        duration_days=duration_days,
+        alpha=alpha
+    )
+
+
+@st.cache_data(show_spinner=False)
+def cached_power_curve(baseline_mean: float, baseline_std: float, mde_pct: float, alpha: float) -> np.ndarray:
+    """Achieved power over POWER_CURVE_DURATIONS (memoized on inputs)."""
+    return get_power_calculator().calculate_achieved_power_curve(
+        baseline_mean=baseline_mean,
+        baseline_std=baseline_std,
+        mde_pct=mde_pct,
+        durations=POWER_CURVE_DURATIONS,
+        alpha=alpha
+    )
+
+
+@st.cache_data(show_spinner=False)
+def cached_synthetic(test_data: np.ndarray, controls_stack: np.ndarray, names: tuple, alpha: float = 1.0) -> tuple:
+    """Fit the synthetic control for a (test series, donor set) pair (memoized on inputs)."""
+    return get_matcher().fit_synthetic_control(test_data, controls_stack, list(names), alpha=alpha)
+
+
+@st.cache_data(show_spinner=False)
+def build_weights_pie(labels: tuple, values: tuple) -> "go.Figure":
+    """Pie chart of synthetic control weights."""
+    import plotly.graph_objects as go  # deferred: plotly is only needed once a chart is built
+    fig = go.Figure(data=[go.Pie(labels=list(labels), values=list(values), hole=0.3)])
+    fig.update_layout(height=300, showlegend=True)
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def build_power_curve_fig(durations: np.ndarray, powers: np.ndarray, selected_days: int) -> "go.Figure":
+    """Power vs duration line with target-power and selected-duration markers."""
+    import plotly.graph_objects as go
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=durations,
+        y=powers,
+        mode='lines+markers',
+        name='Achieved Power',
+        line=dict(color='#1f77b4', width=3),
+        marker=dict(size=8)
+    ))
+    fig.add_hline(y=0.80, line_dash="dash", line_color="green", annotation_text="Target Power (80%)")
+    fig.add_vline(x=selected_days, line_dash="dot", line_color="orange", annotation_text=f"Selected: {selected_days}d")
+    fig.update_layout(
+        title="Power vs Duration",
+        xaxis_title="Duration (days)",
+        yaxis_title="Statistical Power",
+        height=300,
+        hovermode='x unified'
+    )
+    return fig
 
 # ==============================================================================
-# GENERATE & CACHE CONTROL MARKET DATA (one-time on page load)
+# GENERATE & CACHE CONTROL MARKET DATA (shared across sessions)
 # ==============================================================================
 
-if st.session_state['control_markets_data_cached'] is None:
-    with st.spinner("Generating control market data (one-time cache)..."):
-        # Use a fixed seed for reproducible control markets across page loads
-        data_gen = StochasticSEOGenerator(seed=42)
-        
-        control_markets_data = {}
-        for dma in matcher.get_dma_list():
-            baseline_other = data_gen.generate_baseline(n_days=90)
-            control_markets_data[dma], _ = data_gen.generate_control_market(baseline_other)
-        
-        # Cache in session state
-        st.session_state['control_markets_data_cached'] = control_markets_data
-else:
-    control_markets_data = st.session_state['control_markets_data_cached']
+@st.cache_data(show_spinner="Generating control market data (one-time cache)...")
+def build_control_markets(seed: int, n_days: int, n_markets: int) -> tuple:
+    """
+    Generate one control series per DMA with a fixed seed, shape (n_markets, n_days),
+    along with its centered unit-norm form for correlation ranking.
+    """
+    data_gen = StochasticSEOGenerator(seed=seed)
+    baselines = data_gen.generate_baselines_batch(n_markets, n_days=n_days)
+    controls, _ = data_gen.generate_control_markets_batch(baselines)
+    return controls, get_matcher().normalize_controls(controls)
+
+
+# Fixed seed keeps control markets reproducible across page loads
+dma_names = tuple(matcher.get_dma_list())
+dma_index = {name: i for i, name in enumerate(dma_names)}
+control_markets_matrix, control_markets_normalized = build_control_markets(42, 90, len(dma_names))
+
+def level_align(series: np.ndarray, target_mean: float) -> np.ndarray:
+    """Scale a series so its mean matches target_mean (no-op for zero mean)."""
+    series_mean = series.mean()
+    return series * (target_mean / series_mean) if series_mean != 0 else series
+
+
+def market_seed(market: str) -> int:
+    """Stable per-market seed (builtin hash() is randomized per process)."""
+    return int.from_bytes(hashlib.blake2b(market.encode(), digest_size=4).digest(), 'little')
+
+
+@st.cache_data(show_spinner="Generating test market data...")
+def get_test_market_data(market: str, n_days: int = 90) -> np.ndarray:
+    """Generate the reproducible pre-period series for a test market."""
+    data_gen = StochasticSEOGenerator(seed=market_seed(market))
+    baseline = data_gen.generate_baseline(n_days=n_days)
+    test_data, _ = data_gen.generate_control_market(baseline)
+    return test_data
+
 
 # ==============================================================================
 # SECTION A: Market Selection & Matching
@@ -81,22 +212,14 @@ with col2:
     """)
 
 # Generate test market data (unique for each test market selection)
-with st.spinner("Generating test market data..."):
-    # Use test market name to generate unique but reproducible seed
-    test_market_seed = hash(test_market) % 10000
-    data_gen = StochasticSEOGenerator(seed=test_market_seed)
-    
-    # Generate baseline data (90 days)
-    baseline = data_gen.generate_baseline(n_days=90)
-    
-    # Generate test market
-    test_data, _ = data_gen.generate_control_market(baseline)
+test_data = get_test_market_data(test_market, n_days=90)
+test_mean = float(np.mean(test_data))
 
 # Market matching via Euclidean distance
 st.subheader("📊 Section 2: Find Best Control Markets")
 
 with st.spinner("Calculating Euclidean distances..."):
-    matches = matcher.find_best_controls(test_data, control_markets_data, top_k=5)
+    matches = cached_matches(test_data, control_markets_matrix, control_markets_normalized, dma_names, top_k=5)
 
 st.dataframe(matches, use_container_width=True, hide_index=True)
 
@@ -110,18 +233,16 @@ selected_control = st.selectbox(
 st.session_state['control_market'] = selected_control
 
 # Level-align control to test market mean (best practice for fair comparison)
-control_raw = control_markets_data[selected_control]
-test_mean = np.mean(test_data)
-control_mean = np.mean(control_raw)
-control_aligned = control_raw * (test_mean / control_mean) if control_mean != 0 else control_raw
+control_raw = control_markets_matrix[dma_index[selected_control]]
+control_aligned = level_align(control_raw, test_mean)
 
 st.session_state['pre_period_data'] = {
-    'test': test_data,
-    'control': control_aligned
+    'test': np.asarray(test_data, dtype=np.float64),
+    'control': np.asarray(control_aligned, dtype=np.float64)
 }
 
-# Show pre-period similarity
-pre_similarity = matcher.correlation(test_data, control_markets_data[selected_control])
+# Show pre-period similarity (already computed for every candidate by the matcher)
+pre_similarity = matches.loc[matches['Market'] == selected_control, 'Correlation'].iloc[0]
 st.metric("Pre-Period Correlation", f"{pre_similarity:.3f}")
 
 st.markdown("---")
@@ -142,20 +263,18 @@ if use_synthetic:
     st.info("Building synthetic control from top 3 candidates...")
     
     top_3_controls = matches['Market'].head(3).tolist()
-    top_3_data = {name: control_markets_data[name] for name in top_3_controls}
     
-    # Build synthetic control
-    synthetic, sc_metadata = matcher.build_synthetic_control(
+    # Build synthetic control (memoized per test series and donor set)
+    controls_stack = control_markets_matrix[[dma_index[name] for name in top_3_controls]]
+    synthetic, sc_metadata = cached_synthetic(
         test_data,
-        top_3_data,
-        selected_controls=top_3_controls,
+        controls_stack,
+        tuple(top_3_controls),
         alpha=1.0
     )
     
     # Level-align synthetic control to test market mean
-    synthetic_mean = np.mean(synthetic)
-    test_mean = np.mean(test_data)
-    synthetic_aligned = synthetic * (test_mean / synthetic_mean) if synthetic_mean != 0 else synthetic
+    synthetic_aligned = level_align(synthetic, test_mean)
     
     # Update session state with aligned synthetic control
     st.session_state['pre_period_data']['control'] = synthetic_aligned
@@ -174,12 +293,10 @@ if use_synthetic:
     
     with col2:
         # Pie chart of weights
-        fig = go.Figure(data=[go.Pie(
-            labels=list(sc_metadata['normalized_weights'].keys()),
-            values=[abs(w) for w in sc_metadata['normalized_weights'].values()],
-            hole=0.3
-        )])
-        fig.update_layout(height=300, showlegend=True)
+        fig = build_weights_pie(
+            tuple(sc_metadata['normalized_weights'].keys()),
+            tuple(abs(w) for w in sc_metadata['normalized_weights'].values())
+        )
         st.plotly_chart(fig, use_container_width=True)
     
     # Show fit quality
@@ -216,36 +333,12 @@ else:
     control_series = st.session_state['pre_period_data']['control']
     control_label = "Control Market (Level-Aligned)"
 
-pre_df = pd.DataFrame({
-    'date': pd.date_range(start='2024-10-01', periods=len(test_data), freq='D'),
-    'test_market': test_data,
-    'control_market': control_series
-})
-
-fig_pre = go.Figure()
-fig_pre.add_trace(go.Scatter(
-    x=pre_df['date'],
-    y=pre_df['test_market'],
-    mode='lines',
-    name='Test Market',
-    line=dict(color='#1f77b4', width=2)
-))
-fig_pre.add_trace(go.Scatter(
-    x=pre_df['date'],
-    y=pre_df['control_market'],
-    mode='lines',
-    name=control_label,
-    line=dict(color='#ff7f0e', width=2)
-))
-fig_pre.update_layout(
-    title="Pre-Period Trend (90 Days)",
-    xaxis_title="Date",
-    yaxis_title="Metric Value",
-    height=350,
-    hovermode='x unified',
-    template='plotly_white'
+# 90-point, 2-series line: Streamlit's native chart is enough (no plotly.js)
+chart_df = pd.DataFrame(
+    {'Test Market': test_data, control_label: control_series},
+    index=pd.date_range(start='2024-10-01', periods=len(test_data), freq='D')
 )
-st.plotly_chart(fig_pre, use_container_width=True)
+st.line_chart(chart_df, height=350, use_container_width=True)
 
 st.markdown("---")
 
@@ -257,7 +350,7 @@ st.subheader("📈 Section 4: Power & Duration Calculation")
 
 # Get baseline statistics from pre-period data
 test_pre = st.session_state['pre_period_data']['test']
-baseline_stats = power_calc.estimate_sample_characteristics(test_pre)
+baseline_stats = cached_sample_characteristics(test_pre)
 
 st.info(f"""
 **Pre-Period Statistics:**
@@ -266,145 +359,132 @@ st.info(f"""
 - Coefficient of Variation: {baseline_stats['baseline_cv']:.3f}
 """)
 
-# Input power parameters
-col1, col2, col3 = st.columns(3)
+@st.fragment
+def power_section(baseline_stats: dict, template: dict):
+    """
+    Power inputs, duration calculation and navigation.
+    
+    Runs as a fragment so the sliders below rerun only this section instead
+    of market generation, matching and synthetic-control fitting above.
+    """
+    # Input power parameters
+    col1, col2, col3 = st.columns(3)
 
-with col1:
-    alpha = st.select_slider(
-        "Significance Level (α)",
-        options=[0.01, 0.05, 0.10],
-        value=0.05,
-        help="Probability of Type I error (rejecting true null)"
-    )
+    with col1:
+        alpha = st.select_slider(
+            "Significance Level (α)",
+            options=[0.01, 0.05, 0.10],
+            value=0.05,
+            help="Probability of Type I error (rejecting true null)"
+        )
 
-with col2:
-    power = st.select_slider(
-        "Statistical Power (1-β)",
-        options=[0.70, 0.80, 0.90],
-        value=0.80,
-        help="Probability of detecting true effect"
-    )
+    with col2:
+        power = st.select_slider(
+            "Statistical Power (1-β)",
+            options=[0.70, 0.80, 0.90],
+            value=0.80,
+            help="Probability of detecting true effect"
+        )
 
-with col3:
-    mde_pct = st.number_input(
-        "MDE (%)",
-        value=template['default_mde'],
-        min_value=1,
-        max_value=50,
-        step=1,
-        help="Minimum Detectable Effect as percentage"
+    with col3:
+        mde_pct = st.number_input(
+            "MDE (%)",
+            value=template['default_mde'],
+            min_value=1,
+            max_value=50,
+            step=1,
+            help="Minimum Detectable Effect as percentage"
+        )
+
+    # Calculate required duration
+    calc_result = cached_required_duration(
+        float(baseline_stats['baseline_mean']),
+        float(baseline_stats['baseline_std']),
+        mde_pct / 100,
+        alpha,
+        power
     )
 
-# Calculate required duration
-calc_result = power_calc.calculate_required_duration(
-    baseline_mean=baseline_stats['baseline_mean'],
-    baseline_std=baseline_stats['baseline_std'],
-    mde_pct=mde_pct / 100,
-    alpha=alpha,
-    power=power
-)
+    required_days = calc_result['required_days']
 
-required_days = calc_result['required_days']
+    # Show calculation breakdown
+    st.markdown("---")
+    st.subheader("📐 Sample Size Calculation")
 
-# Show calculation breakdown
-st.markdown("---")
-st.subheader("📐 Sample Size Calculation")
+    col1, col2 = st.columns([1, 1])
 
-col1, col2 = st.columns([1, 1])
+    with col1:
+        st.markdown("""
+        **Formula (Two-Sample T-Test):**
+        
+        $$n = \\frac{2 \\times (Z_\\alpha + Z_\\beta)^2 \\times \\sigma^2}{\\Delta^2}$$
+        
+        Where:
+        - n = required days
+        - Z_α, Z_β = critical values
+        - σ = baseline std dev
+        - Δ = absolute effect size
+        """)
 
-with col1:
-    st.markdown("""
-    **Formula (Two-Sample T-Test):**
-    
-    $$n = \\frac{2 \\times (Z_\\alpha + Z_\\beta)^2 \\times \\sigma^2}{\\Delta^2}$$
-    
-    Where:
-    - n = required days
-    - Z_α, Z_β = critical values
-    - σ = baseline std dev
-    - Δ = absolute effect size
-    """)
+    with col2:
+        st.markdown(f"""
+        **Your Calculation:**
+        
+        - **Z_α** (α={alpha}) = {calc_result['z_alpha']:.3f}
+        - **Z_β** (power={power:.0%}) = {calc_result['z_beta']:.3f}
+        - **σ** (baseline std) = {baseline_stats['baseline_std']:.1f}
+        - **Δ** (MDE) = {mde_pct}% × {baseline_stats['baseline_mean']:.0f} = {calc_result['delta_absolute']:.1f}
+        
+        ---
+        
+        $$n = \\frac{{2 \\times ({calc_result['z_alpha']:.3f} + {calc_result['z_beta']:.3f})^2 \\times {baseline_stats['baseline_std']:.1f}^2}}{{{calc_result['delta_absolute']:.1f}^2}}$$
+        
+        $$n = {required_days} \\text{{ days}}$$
+        """)
 
-with col2:
-    st.markdown(f"""
-    **Your Calculation:**
-    
-    - **Z_α** (α={alpha}) = {calc_result['z_alpha']:.3f}
-    - **Z_β** (power={power:.0%}) = {calc_result['z_beta']:.3f}
-    - **σ** (baseline std) = {baseline_stats['baseline_std']:.1f}
-    - **Δ** (MDE) = {mde_pct}% × {baseline_stats['baseline_mean']:.0f} = {calc_result['delta_absolute']:.1f}
-    
-    ---
-    
-    $$n = \\frac{{2 \\times ({calc_result['z_alpha']:.3f} + {calc_result['z_beta']:.3f})^2 \\times {baseline_stats['baseline_std']:.1f}^2}}{{{calc_result['delta_absolute']:.1f}^2}}$$
-    
-    $$n = {required_days} \\text{{ days}}$$
-    """)
+    st.success(f"**Required Duration: {required_days} days**")
 
-st.success(f"**Required Duration: {required_days} days**")
+    # Duration slider for override
+    col1, col2 = st.columns([2, 1])
 
-# Duration slider for override
-col1, col2 = st.columns([2, 1])
+    with col1:
+        selected_days = st.slider(
+            "Adjust Duration (Experiment Days)",
+            min_value=7,
+            max_value=90,
+            value=required_days,
+            step=7,
+            help="Increase duration to achieve higher power, or decrease to run faster"
+        )
 
-with col1:
-    selected_days = st.slider(
-        "Adjust Duration (Experiment Days)",
-        min_value=7,
-        max_value=90,
-        value=required_days,
-        step=7,
-        help="Increase duration to achieve higher power, or decrease to run faster"
+    with col2:
+        # Calculate achieved power at selected duration
+        power_result = cached_achieved_power(
+            float(baseline_stats['baseline_mean']),
+            float(baseline_stats['baseline_std']),
+            mde_pct / 100,
+            selected_days,
+            alpha
+        )
+        achieved_power = power_result['achieved_power']
+        status, msg = power_calc.get_power_status(achieved_power)
+        st.metric("Achieved Power", f"{achieved_power:.1%}")
+
+    # Power vs Duration chart
+    durations = POWER_CURVE_DURATIONS
+    powers = cached_power_curve(
+        float(baseline_stats['baseline_mean']),
+        float(baseline_stats['baseline_std']),
+        mde_pct / 100,
+        alpha
     )
 
-with col2:
-    # Calculate achieved power at selected duration
-    power_result = power_calc.calculate_achieved_power(
-        baseline_mean=baseline_stats['baseline_mean'],
-        baseline_std=baseline_stats['baseline_std'],
-        mde_pct=mde_pct / 100,
-        duration_days=selected_days,
-        alpha=alpha
-    )
-    achieved_power = power_result['achieved_power']
-    status, msg = power_calc.get_power_status(achieved_power)
-    st.metric("Achieved Power", f"{achieved_power:.1%}")
-
-# Power vs Duration chart
-durations = range(7, 91, 7)
-powers = []
-for d in durations:
-    p_res = power_calc.calculate_achieved_power(
-        baseline_mean=baseline_stats['baseline_mean'],
-        baseline_std=baseline_stats['baseline_std'],
-        mde_pct=mde_pct / 100,
-        duration_days=d,
-        alpha=alpha
-    )
-    powers.append(p_res['achieved_power'])
-
-fig = go.Figure()
-fig.add_trace(go.Scatter(
-    x=list(durations),
-    y=powers,
-    mode='lines+markers',
-    name='Achieved Power',
-    line=dict(color='#1f77b4', width=3),
-    marker=dict(size=8)
-))
-fig.add_hline(y=0.80, line_dash="dash", line_color="green", annotation_text="Target Power (80%)")
-fig.add_vline(x=selected_days, line_dash="dot", line_color="orange", annotation_text=f"Selected: {selected_days}d")
-fig.update_layout(
-    title="Power vs Duration",
-    xaxis_title="Duration (days)",
-    yaxis_title="Statistical Power",
-    height=300,
-    hovermode='x unified'
-)
-st.plotly_chart(fig, use_container_width=True)
+    fig = build_power_curve_fig(durations, powers, selected_days)
+    st.plotly_chart(fig, use_container_width=True)
 
-# SQL query demonstration
-with st.expander("🔍 SQL: View Power Calculation Query"):
-    st.code("""
+    # SQL query demonstration
+    with st.expander("🔍 SQL: View Power Calculation Query"):
+        st.code("""
 SELECT
     baseline_mean,
     baseline_std,
@@ -418,30 +498,33 @@ FROM power_calculations
 WHERE template_id = :template_id
 ORDER BY created_at DESC
 LIMIT 1
-    """, language="sql")
+        """, language="sql")
 
-st.markdown("---")
+    st.markdown("---")
 
-# ==============================================================================
-# Navigation & Summary
-# ==============================================================================
+    # ==============================================================================
+    # Navigation & Summary
+    # ==============================================================================
 
-col1, col2, col3 = st.columns(3)
+    col1, col2, col3 = st.columns(3)
 
-with col1:
-    if st.button("← Back to Template", use_container_width=True):
-        st.switch_page("pages/1_📋_SEO_Template.py")
+    with col1:
+        if st.button("← Back to Template", use_container_width=True):
+            st.switch_page("pages/1_📋_SEO_Template.py")
 
-with col2:
-    st.info(f"**Duration:** {selected_days} days | **Power:** {achieved_power:.1%}")
-
-with col3:
-    if st.button("Next: Run Simulation →", use_container_width=True):
-        # Save to session state
-        st.session_state['experiment_duration'] = selected_days
-        st.session_state['achieved_power'] = achieved_power
-        st.session_state['mde_pct'] = mde_pct / 100
-        st.session_state['alpha'] = alpha
-        st.session_state['power'] = power
-        
-        st.switch_page("pages/3_⚡_Simulation_Engine.py")
+    with col2:
+        st.info(f"**Duration:** {selected_days} days | **Power:** {achieved_power:.1%}")
+
+    with col3:
+        if st.button("Next: Run Simulation →", use_container_width=True):
+            # Save to session state
+            st.session_state['experiment_duration'] = selected_days
+            st.session_state['achieved_power'] = achieved_power
+            st.session_state['mde_pct'] = mde_pct / 100
+            st.session_state['alpha'] = alpha
+            st.session_state['power'] = power
+            
+            st.switch_page("pages/3_⚡_Simulation_Engine.py")
+
+
+power_section(baseline_stats, template)
@@ -2,9 +2,11 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+import hashlib
+import secrets
 import uuid
 from src.data_generator import StochasticSEOGenerator
+from src.chart_utils import downsample_indices
 from src.db_manager import DuckDBManager
 
 st.set_page_config(page_title="Simulation Engine", layout="wide")
@@ -28,6 +30,142 @@ for key in required_keys:
 
 st.title("⚡ Simulation Engine")
 
+CHART_MAX_POINTS = 500
+
+
+@st.cache_data
+def build_confounder_table(confounder_info):
+    """Summary table of the confounders applied in a simulation run."""
+    return pd.DataFrame({
+        'Type': [c['type'].replace('_', ' ').title() for c in confounder_info],
+        'Start Day': [c.get('start_day', 'N/A') for c in confounder_info],
+        'Duration': [
+            f"{c['magnitude']:.0%}" if 'magnitude' in c else f"{c.get('loss_fraction', 0):.0%}"
+            for c in confounder_info
+        ]
+    })
+
+
+# Figures only depend on data that is fixed for the session, so they are built
+# once and reused across reruns instead of re-validating every trace.
+# cache_data hands each caller its own copy, as on the Experiment Design page.
+@st.cache_data(show_spinner=False, max_entries=8)
+def build_pre_period_fig(test_pre, control_pre, pre_start):
+    """Pre-period preview chart of test vs control."""
+    dates = pd.date_range(start=pre_start, periods=len(test_pre), freq='D')
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=dates,
+        y=test_pre,
+        mode='lines',
+        name='Test Market',
+        line=dict(color='#1f77b4', width=2)
+    ))
+    fig.add_trace(go.Scatter(
+        x=dates,
+        y=control_pre,
+        mode='lines',
+        name='Control Market',
+        line=dict(color='#ff7f0e', width=2)
+    ))
+    fig.update_layout(
+        title="Pre-Period Only",
+        xaxis_title="Date",
+        yaxis_title="Metric Value",
+        height=350,
+        hovermode='x unified',
+        template='plotly_white'
+    )
+    return fig
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def build_simulation_fig(data, intervention_date, confounder_markers):
+    """
+    Full-timeline chart of test vs control with intervention and
+    confounder markers. `confounder_markers` is a tuple of (date, label).
+    """
+    # Long runs are thinned to a min/max envelope before serializing
+    chart_data = data
+    keep = downsample_indices(
+        [data['test_market'].to_numpy(), data['control_market'].to_numpy()],
+        target=CHART_MAX_POINTS
+    )
+    if keep is not None:
+        chart_data = data.iloc[keep]
+    
+    fig = go.Figure()
+    
+    # Test market
+    fig.add_trace(go.Scatter(
+        x=chart_data['date'],
+        y=chart_data['test_market'],
+        mode='lines',
+        name='Test Market',
+        line=dict(color='#1f77b4', width=2)
+    ))
+    
+    # Control market
+    fig.add_trace(go.Scatter(
+        x=chart_data['date'],
+        y=chart_data['control_market'],
+        mode='lines',
+        name='Control Market',
+        line=dict(color='#ff7f0e', width=2)
+    ))
+    
+    # Intervention and confounder markers, collected and applied in one layout update
+    shapes = []
+    annotations = []
+    if intervention_date:
+        # Shapes instead of add_vline to avoid datetime arithmetic issues
+        shapes.append(dict(
+            type="line",
+            x0=intervention_date, x1=intervention_date,
+            y0=0, y1=1,
+            yref="paper",
+            line=dict(color="red", width=2, dash="dash")
+        ))
+        annotations.append(dict(
+            x=intervention_date,
+            y=1,
+            yref="paper",
+            text="Intervention",
+            showarrow=False,
+            yanchor="top"
+        ))
+    
+    for confounder_date, confounder_name in confounder_markers:
+        shapes.append(dict(
+            type="line",
+            x0=confounder_date, x1=confounder_date,
+            y0=0, y1=1,
+            yref="paper",
+            line=dict(color="orange", width=1, dash="dot")
+        ))
+        annotations.append(dict(
+            x=confounder_date,
+            y=0,
+            yref="paper",
+            text=confounder_name,
+            showarrow=False,
+            yanchor="bottom"
+        ))
+    
+    fig.update_layout(
+        title="Test Market vs Control Market Over Time",
+        xaxis_title="Date",
+        yaxis_title="Metric Value",
+        # One axis-level format instead of a per-trace hovertemplate
+        yaxis_hoverformat='.0f',
+        height=500,
+        hovermode='x unified',
+        template='plotly_white',
+        shapes=shapes,
+        annotations=annotations
+    )
+    return fig
+
 # Get from session state
 template = st.session_state['selected_template']
 test_market = st.session_state['test_market']
@@ -45,19 +183,33 @@ if not pre_period_data:
     st.error("Missing pre-period data from Page 2. Please redo Experiment Design.")
     st.stop()
 
-test_pre = np.array(pre_period_data['test'])
-control_pre = np.array(pre_period_data['control'])
+# Page 2 stores float64 ndarrays, so these are zero-copy references
+test_pre = np.asarray(pre_period_data['test'], dtype=np.float64)
+control_pre = np.asarray(pre_period_data['control'], dtype=np.float64)
 pre_days = len(test_pre)
 pre_start = pd.to_datetime("2024-10-01")
-pre_dates = pd.date_range(start=pre_start, periods=pre_days, freq='D')
 
-pre_df = pd.DataFrame({
-    'date': pre_dates,
-    'test_market': test_pre,
-    'control_market': control_pre,
-    'period': ['pre'] * pre_days,
-    'day_num': range(1, pre_days + 1)
-})
+# The pre-period frame only depends on pre_period_data, so build it once and
+# rebuild only when Page 2 hands over a different pre-period. Keyed on the
+# series content: Page 2 rebuilds the dict on every rerun, so its id() can be
+# reused by a different pre-period.
+pre_df_key = hashlib.blake2b(test_pre.tobytes() + control_pre.tobytes(), digest_size=16).hexdigest()
+if st.session_state.get('pre_df_key') != pre_df_key:
+    pre_dates = pd.date_range(start=pre_start, periods=pre_days, freq='D')
+    # Market series stay float64 end to end, like the generator output, so
+    # the pre and post halves of the simulation frame share one dtype
+    st.session_state['pre_df'] = pd.DataFrame({
+        'date': pre_dates,
+        'test_market': test_pre,
+        'control_market': control_pre,
+        'period': ['pre'] * pre_days,
+        'day_num': np.arange(1, pre_days + 1, dtype=np.int32)
+    })
+    st.session_state['pre_dates'] = pre_dates
+    st.session_state['pre_df_key'] = pre_df_key
+
+pre_df = st.session_state['pre_df']
+pre_dates = st.session_state['pre_dates']
 
 st.markdown(f"""
 **Template:** {template['name']}
@@ -73,29 +225,7 @@ st.markdown("---")
 
 st.subheader("📈 Historical Pre-Period (90 Days)")
 
-fig_pre = go.Figure()
-fig_pre.add_trace(go.Scatter(
-    x=pre_df['date'],
-    y=pre_df['test_market'],
-    mode='lines',
-    name='Test Market',
-    line=dict(color='#1f77b4', width=2)
-))
-fig_pre.add_trace(go.Scatter(
-    x=pre_df['date'],
-    y=pre_df['control_market'],
-    mode='lines',
-    name='Control Market',
-    line=dict(color='#ff7f0e', width=2)
-))
-fig_pre.update_layout(
-    title="Pre-Period Only",
-    xaxis_title="Date",
-    yaxis_title="Metric Value",
-    height=350,
-    hovermode='x unified',
-    template='plotly_white'
-)
+fig_pre = build_pre_period_fig(test_pre, control_pre, pre_start)
 st.plotly_chart(fig_pre, use_container_width=True)
 
 st.markdown("---")
@@ -151,10 +281,11 @@ st.markdown("---")
 
 st.subheader("▶️ Run Simulation")
 
-# Initialize data generator
-data_gen = StochasticSEOGenerator(seed=int(datetime.now().timestamp()) % 10000)
-
 if st.button("🚀 Generate & Run Simulation", use_container_width=True, type="primary"):
+    # Fresh 64-bit seed per run; kept in the metadata so a run can be replayed
+    seed = secrets.randbits(64)
+    data_gen = StochasticSEOGenerator(seed=seed)
+
     with st.spinner("Generating experiment data..."):
         # --- Generate post-period only, reusing historical pre-period ---
         # Baseline anchored to pre-period test mean for continuity
@@ -164,8 +295,13 @@ if st.button("🚀 Generate & Run Simulation", use_container_width=True, type="p
             baseline_mean=pre_test_mean
         )
 
+        # Both markets share the baseline's reductions (effect starts at day 0,
+        # so the post-period mean is the whole baseline's mean)
+        baseline_std = baseline_post.std()
+        baseline_mean = baseline_post.mean()
+
         # Control post: correlated to baseline, then scaled to pre control level
-        control_post, control_corr = data_gen.generate_control_market(baseline_post)
+        control_post, control_corr = data_gen.generate_control_market(baseline_post, baseline_std=baseline_std)
         control_scale = (np.mean(control_pre) / np.mean(control_post)) if np.mean(control_post) != 0 else 1.0
         control_post = control_post * control_scale
 
@@ -176,7 +312,9 @@ if st.button("🚀 Generate & Run Simulation", use_container_width=True, type="p
                 'intervention_day': 0,
                 'mde_pct': mde_pct,
                 'effect_shape': 'step'
-            }
+            },
+            baseline_std=baseline_std,
+            post_mean=baseline_mean
         )
 
         # Build post-period date index (needed for confounder alignment)
@@ -197,17 +335,19 @@ if st.button("🚀 Generate & Run Simulation", use_container_width=True, type="p
                 conf_info['start_date'] = post_dates[conf_info.get('start_day', 0)] if conf_info.get('start_day') is not None else None
                 confounder_log.append(conf_info)
 
-        # Build post dataframe
-        post_df = pd.DataFrame({
-            'date': post_dates,
-            'test_market': treatment_post,
-            'control_market': control_post,
-            'period': ['post'] * duration_days,
-            'day_num': range(pre_days + 1, pre_days + duration_days + 1)
-        })
-
-        # Combine pre + post
-        data = pd.concat([pre_df, post_df], ignore_index=True)
+        # Combine pre + post straight from the arrays; both halves share the
+        # same layout so there is nothing for pd.concat to align
+        data = pd.DataFrame({
+            'date': np.concatenate([pre_df['date'].to_numpy(), post_dates.to_numpy()]),
+            'test_market': np.concatenate([pre_df['test_market'].to_numpy(), treatment_post]),
+            'control_market': np.concatenate([pre_df['control_market'].to_numpy(), control_post]),
+            # Categorical codes make the downstream period masks int8 compares
+            'period': pd.Categorical.from_codes(
+                np.repeat(np.array([0, 1], dtype=np.int8), [pre_days, duration_days]),
+                categories=['pre', 'post']
+            ),
+            'day_num': np.arange(1, pre_days + duration_days + 1, dtype=np.int32)
+        }, copy=False)
 
         metadata = {
             'test_market_name': test_market,
@@ -216,12 +356,43 @@ if st.button("🚀 Generate & Run Simulation", use_container_width=True, type="p
             'post_period_days': duration_days,
             'effect_info': effect_info,
             'control_correlation': float(np.corrcoef(test_pre, control_pre)[0, 1]),
-            'confounders': confounder_log
+            'confounders': confounder_log,
+            'intervention_date': post_dates[0] if duration_days > 0 else None,
+            'seed': seed
+        }
+
+        # Summary metrics are fixed once the simulation has run, so compute
+        # them here rather than re-splitting the frame on every rerun. Pages 4
+        # and 5 read the same dict instead of masking on 'period' again.
+        # NaN-aware: the Tracking Break confounder blanks out test-market days
+        post_avg_test = float(np.nanmean(treatment_post)) if duration_days > 0 else float('nan')
+        post_avg_control = float(np.nanmean(control_post)) if duration_days > 0 else float('nan')
+        pre_avg_control = float(np.nanmean(control_pre))
+        # Outliers are |z| > 3 on the post-period test-control gap; comparing
+        # the deviation against 3 * std skips materializing the z-scores
+        post_diffs = treatment_post - control_post
+        post_outliers = int(np.count_nonzero(
+            np.abs(post_diffs - np.nanmean(post_diffs)) > 3 * np.nanstd(post_diffs)
+        )) if duration_days > 0 else 0
+        metrics = {
+            'pre_avg_test': float(np.nanmean(test_pre)),
+            'pre_avg_control': pre_avg_control,
+            'pre_sum_test': float(np.nansum(test_pre)),
+            'pre_avg_diff': float(np.nanmean(test_pre - control_pre)),
+            'pre_corr': metadata['control_correlation'],
+            'post_avg_test': post_avg_test,
+            'post_avg_control': post_avg_control,
+            'post_sum_test': float(np.nansum(treatment_post)),
+            'post_outliers': post_outliers,
+            'post_lift_pct': ((post_avg_test - post_avg_control) / post_avg_control * 100) if post_avg_control != 0 else float('nan')
         }
 
         # Store in session state
         st.session_state['simulation_data'] = data
         st.session_state['simulation_metadata'] = metadata
+        st.session_state['simulation_metrics'] = metrics
+        # Effect statistics belong to the previous run until Page 4 refits
+        st.session_state.pop('ci_results', None)
         
         st.success("✅ Simulation complete!")
         st.rerun()
@@ -237,10 +408,9 @@ if 'simulation_data' in st.session_state:
     
     data = st.session_state['simulation_data']
     metadata = st.session_state['simulation_metadata']
+    metrics = st.session_state['simulation_metrics']
     
     # Summary metrics
-    pre_data = data[data['period'] == 'pre']
-    post_data = data[data['period'] == 'post']
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -252,7 +422,7 @@ if 'simulation_data' in st.session_state:
         )
     
     with col2:
-        pre_avg_diff = (pre_data['test_market'] - pre_data['control_market']).mean()
+        pre_avg_diff = metrics['pre_avg_diff']
         st.metric(
             "Pre-Period Avg Difference",
             f"{pre_avg_diff:+.0f}",
@@ -260,9 +430,7 @@ if 'simulation_data' in st.session_state:
         )
     
     with col3:
-        post_avg_test = post_data['test_market'].mean()
-        post_avg_control = post_data['control_market'].mean()
-        post_lift_pct = ((post_avg_test - post_avg_control) / post_avg_control * 100) if post_avg_control != 0 else float('nan')
+        post_lift_pct = metrics['post_lift_pct']
         st.metric(
             "Observed Effect (Post Lift)",
             f"{post_lift_pct:+.1f}%",
@@ -284,79 +452,13 @@ if 'simulation_data' in st.session_state:
     # Interactive chart
     st.subheader("📈 Time Series: Test vs Control")
     
-    fig = go.Figure()
-    
-    # Test market
-    fig.add_trace(go.Scatter(
-        x=data['date'],
-        y=data['test_market'],
-        mode='lines',
-        name='Test Market',
-        line=dict(color='#1f77b4', width=2),
-        hovertemplate='<b>Test Market</b><br>Date: %{x}<br>Value: %{y:.0f}<extra></extra>'
-    ))
-    
-    # Control market
-    fig.add_trace(go.Scatter(
-        x=data['date'],
-        y=data['control_market'],
-        mode='lines',
-        name='Control Market',
-        line=dict(color='#ff7f0e', width=2),
-        hovertemplate='<b>Control Market</b><br>Date: %{x}<br>Value: %{y:.0f}<extra></extra>'
-    ))
-    
-    # Intervention line
-    intervention_date = data[data['period'] == 'post'].iloc[0]['date'] if len(post_data) > 0 else None
-    if intervention_date:
-        # Use add_shape instead of add_vline to avoid datetime arithmetic issues
-        fig.add_shape(
-            type="line",
-            x0=intervention_date, x1=intervention_date,
-            y0=0, y1=1,
-            yref="paper",
-            line=dict(color="red", width=2, dash="dash")
-        )
-        fig.add_annotation(
-            x=intervention_date,
-            text="Intervention",
-            showarrow=False,
-            yanchor="top"
-        )
-    
-    # Confounder annotations
+    # start_date is resolved from post_dates when the confounder is applied
     confounder_info = metadata.get('confounders', [])
-    for confounder in confounder_info:
-        # Prefer stored start_date; fallback to global day_num lookup
-        confounder_date = confounder.get('start_date')
-        if confounder_date is None and confounder.get('start_day_global') is not None:
-            match = data[data['day_num'] == confounder['start_day_global']]
-            if len(match) > 0:
-                confounder_date = match.iloc[0]['date']
-        if confounder_date:
-            confounder_name = confounder['type'].replace('_', ' ').title()
-            fig.add_shape(
-                type="line",
-                x0=confounder_date, x1=confounder_date,
-                y0=0, y1=1,
-                yref="paper",
-                line=dict(color="orange", width=1, dash="dot")
-            )
-            fig.add_annotation(
-                x=confounder_date,
-                text=confounder_name,
-                showarrow=False,
-                yanchor="bottom"
-            )
-    
-    fig.update_layout(
-        title="Test Market vs Control Market Over Time",
-        xaxis_title="Date",
-        yaxis_title="Metric Value",
-        height=500,
-        hovermode='x unified',
-        template='plotly_white'
+    confounder_markers = tuple(
+        (c['start_date'], c['type'].replace('_', ' ').title())
+        for c in confounder_info if c.get('start_date')
     )
+    fig = build_simulation_fig(data, metadata.get('intervention_date'), confounder_markers)
     
     st.plotly_chart(fig, use_container_width=True)
     
@@ -366,14 +468,7 @@ if 'simulation_data' in st.session_state:
     if confounder_info:
         st.subheader("⚠️ Confounders Applied")
         
-        confounders_df = pd.DataFrame([
-            {
-                'Type': c['type'].replace('_', ' ').title(),
-                'Start Day': c.get('start_day', 'N/A'),
-                'Duration': f"{c.get('magnitude', 0):.0%}" if 'magnitude' in c else f"{c.get('loss_fraction', 0):.0%}"
-            }
-            for c in confounder_info
-        ])
+        confounders_df = build_confounder_table(confounder_info)
         
         st.dataframe(confounders_df, use_container_width=True, hide_index=True)
     
@@ -381,11 +476,10 @@ if 'simulation_data' in st.session_state:
     
     # Data preview
     with st.expander("📋 Data Preview"):
-        st.write("**First 10 rows (Pre-period):**")
-        st.dataframe(data.head(10), use_container_width=True, hide_index=True)
-        
-        st.write("**Last 10 rows (Post-period):**")
-        st.dataframe(data.tail(10), use_container_width=True, hide_index=True)
+        # One table for both ends of the run; the period column tells them apart
+        st.write("**First and last 10 rows:**")
+        preview = data.iloc[np.r_[0:min(10, len(data)), max(len(data) - 10, 10):len(data)]]
+        st.dataframe(preview, use_container_width=True, hide_index=True)
     
     # SQL query
     with st.expander("🔍 SQL: Query Simulation Results"):
@@ -412,6 +506,7 @@ ORDER BY date
             # Clear simulation state
             del st.session_state['simulation_data']
             del st.session_state['simulation_metadata']
+            st.session_state.pop('simulation_metrics', None)
             st.switch_page("pages/2_🎯_Experiment_Design.py")
     
     with col2:
@@ -2,12 +2,41 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from causalimpact import CausalImpact
-import matplotlib.pyplot as plt
-import io
+from plotly.subplots import make_subplots
+from scipy.stats import norm
+from src.chart_utils import downsample_indices
 
 st.set_page_config(page_title="Causal Analysis", layout="wide")
 
+# Above this many points per trace the diagnostics switch to WebGL rendering;
+# below it SVG is cheaper and avoids using up the browser's WebGL contexts
+WEBGL_MIN_POINTS = 1000
+# Longer diagnostics are thinned to a min/max envelope of about this many points
+CHART_MAX_POINTS = 2000
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def run_causal_impact(y, X, intervention_day):
+    """
+    Fit CausalImpact of y against X with the intervention at `intervention_day`.
+
+    Cached on the series values, so reruns of the same simulation reuse the
+    fitted model instead of refitting the BSTS. Every simulation draws a new
+    seed and the cache is shared by all sessions, so it is bounded to the
+    most recent fits.
+    """
+    # Deferred: causalimpact pulls in a heavy modelling stack, which should not
+    # be paid for on page loads that hit the cache
+    from causalimpact import CausalImpact
+    
+    ci_data = pd.DataFrame({'y': y, 'X': X})
+    return CausalImpact(
+        ci_data,
+        pre_period=[0, intervention_day - 1],
+        post_period=[intervention_day, len(ci_data) - 1]
+    )
+
+
 # Check if we have simulation data
 if 'simulation_data' not in st.session_state:
     st.error("No simulation data found. Please run the simulation first.")
@@ -19,6 +48,7 @@ st.title("📊 Causal Analysis & Validity Checks")
 
 data = st.session_state['simulation_data']
 metadata = st.session_state['simulation_metadata']
+metrics = st.session_state['simulation_metrics']
 template = st.session_state['selected_template']
 
 # Check if synthetic control was used
@@ -47,135 +77,173 @@ with st.expander("🔍 Debug: Data Statistics"):
     st.write(f"Columns: {data.columns.tolist()}")
     st.write(f"Test market range: [{data['test_market'].min():.0f}, {data['test_market'].max():.0f}]")
     st.write(f"Control market range: [{data['control_market'].min():.0f}, {data['control_market'].max():.0f}]")
-    st.write(f"Pre-period test mean: {data[data['period']=='pre']['test_market'].mean():.0f}")
-    st.write(f"Post-period test mean: {data[data['period']=='post']['test_market'].mean():.0f}")
+    st.write(f"Pre-period test mean: {metrics['pre_avg_test']:.0f}")
+    st.write(f"Post-period test mean: {metrics['post_avg_test']:.0f}")
 
 # Prepare data for CausalImpact (must have integer index)
-ci_data = data[['test_market', 'control_market']].copy()
-ci_data.columns = ['y', 'X']
-# Reset index to integers (0, 1, 2, ...)
-ci_data = ci_data.reset_index(drop=True)
+ci_data = pd.DataFrame({
+    'y': data['test_market'].to_numpy(dtype=np.float64),
+    'X': data['control_market'].to_numpy(dtype=np.float64)
+})
 
 # Find intervention point (day 91 = index 90)
 intervention_day = 90
 
-with st.spinner("Running CausalImpact..."):
-    try:
-        post_start = intervention_day
-        post_end = len(ci_data)
-
-        # Run CausalImpact
-        ci = CausalImpact(ci_data, pre_period=[0, intervention_day - 1], post_period=[intervention_day, len(ci_data) - 1])
-        inferences = ci.inferences.copy()
-        predicted = inferences['preds'].values
-
-        # Compute effects
-        actual_post = ci_data['y'].iloc[post_start:].values
-        predicted_post = inferences['preds'].iloc[post_start:].values
-
-        if len(actual_post) > 0 and len(predicted_post) > 0 and len(actual_post) == len(predicted_post):
-            pointwise_effects = actual_post - predicted_post
-            point_est = np.nansum(pointwise_effects)
-            avg_daily_effect = np.nanmean(pointwise_effects)
-        else:
-            point_est = np.nan
-            avg_daily_effect = np.nan
-
-        post_mean = ci_data['y'].iloc[post_start:].mean()
-        post_sum = ci_data['y'].iloc[post_start:].sum()
-        pct_effect = (point_est / post_sum * 100) if post_sum != 0 and not np.isnan(point_est) else 0.0
-
-        # Statistical significance
-        effect_se = np.nanstd(pointwise_effects) / np.sqrt(len(pointwise_effects)) if len(pointwise_effects) > 0 else np.nan
-        z_score = point_est / effect_se if effect_se and effect_se > 0 else 0
-        p_value = 2 * (1 - np.exp(-abs(z_score) / np.sqrt(2 * np.pi)))
-
-        # Persist results for downstream pages
-        st.session_state['causal_impact'] = ci
-
-        # Display key metrics
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric(
-                "Estimated Effect",
-                f"{point_est:+.0f}",
-                help="Cumulative effect in post-period"
-            )
-        
-        with col2:
-            st.metric(
-                "Effect %",
-                f"{pct_effect:+.1f}%",
-                help="Effect as % of post-period mean"
-            )
-        
-        with col3:
-            st.metric(
-                "Post-Period Mean",
-                f"{post_mean:+.0f}",
-                help="Average value in post-period"
+
+def analysis_section(ci_data, intervention_day):
+    """Fit CausalImpact, store ci_results and render the effect metrics and diagnostics."""
+    with st.spinner("Running CausalImpact..."):
+        try:
+            post_start = intervention_day
+
+            # Run CausalImpact
+            actual = ci_data['y'].to_numpy()
+            ci = run_causal_impact(actual, ci_data['X'].to_numpy(), intervention_day)
+            predicted_all = ci.inferences['preds'].to_numpy()
+
+            # Compute effects on array views rather than pandas slices
+            actual_post = actual[post_start:]
+            predicted_post = predicted_all[post_start:]
+
+            if len(actual_post) > 0 and len(predicted_post) > 0 and len(actual_post) == len(predicted_post):
+                pointwise_effects = actual_post - predicted_post
+                point_est = np.nansum(pointwise_effects)
+                avg_daily_effect = np.nanmean(pointwise_effects)
+            else:
+                point_est = np.nan
+                avg_daily_effect = np.nan
+
+            post_mean = metrics['post_avg_test']
+            post_sum = metrics['post_sum_test']
+            pct_effect = (point_est / post_sum * 100) if post_sum != 0 and not np.isnan(point_est) else 0.0
+
+            # Statistical significance
+            effect_se = np.nanstd(pointwise_effects) / np.sqrt(len(pointwise_effects)) if len(pointwise_effects) > 0 else np.nan
+            z_score = point_est / effect_se if effect_se and effect_se > 0 else 0
+            # Two-sided p-value; norm.sf avoids the cancellation in 1 - cdf for large |z|
+            p_value = 2 * norm.sf(abs(z_score))
+
+            # Persist results for downstream pages; the Executive Summary reads
+            # ci_results rather than recomputing the effect statistics
+            st.session_state['causal_impact'] = ci
+            st.session_state['ci_results'] = {
+                'actual_post': actual_post,
+                'predicted_post': predicted_post,
+                'pointwise_effects': pointwise_effects,
+                'point_est': point_est,
+                'avg_daily_effect': avg_daily_effect,
+                'pre_predicted_mean': float(np.mean(predicted_all[:post_start])),
+                'post_mean': post_mean,
+                'post_sum': post_sum,
+                'pct_effect': pct_effect,
+                'effect_se': effect_se,
+                'z_score': z_score,
+                'p_value': p_value
+            }
+
+            # Display key metrics
+            col1, col2, col3, col4 = st.columns(4)
+
+            with col1:
+                st.metric(
+                    "Estimated Effect",
+                    f"{point_est:+.0f}",
+                    help="Cumulative effect in post-period"
+                )
+
+            with col2:
+                st.metric(
+                    "Effect %",
+                    f"{pct_effect:+.1f}%",
+                    help="Effect as % of post-period mean"
+                )
+
+            with col3:
+                st.metric(
+                    "Post-Period Mean",
+                    f"{post_mean:+.0f}",
+                    help="Average value in post-period"
+                )
+
+            with col4:
+                st.metric(
+                    "Method",
+                    "CausalImpact",
+                    help="Bayesian Structural Time-Series"
+                )
+
+            st.markdown("---")
+
+            # Visualization (common for all methods)
+            st.subheader("Causal Visualization")
+
+            days = np.arange(len(ci_data))
+            pointwise = actual - predicted_all
+
+            cumulative = np.zeros(len(ci_data))
+            cumulative[intervention_day:] = np.cumsum(pointwise[intervention_day:])
+
+            final_cumulative = cumulative[-1]
+            keep = downsample_indices([actual, predicted_all, pointwise, cumulative], target=CHART_MAX_POINTS)
+            if keep is not None:
+                days, actual, predicted_all = days[keep], actual[keep], predicted_all[keep]
+                pointwise, cumulative = pointwise[keep], cumulative[keep]
+            
+            scatter = go.Scattergl if len(days) > WEBGL_MIN_POINTS else go.Scatter
+
+            fig = make_subplots(
+                rows=3, cols=1,
+                shared_xaxes=True,
+                vertical_spacing=0.08,
+                subplot_titles=(
+                    'Original Data vs Predicted Counterfactual',
+                    'Pointwise Effect (Actual - Predicted)',
+                    f'Cumulative Effect (Final: {final_cumulative:+.0f})'
+                )
             )
-        
-        with col4:
-            st.metric(
-                "Method",
-                "CausalImpact",
-                help="Bayesian Structural Time-Series"
+
+            fig.add_trace(scatter(
+                x=days, y=actual, mode='lines', name='Actual (y)',
+                line=dict(color='black', width=2)
+            ), row=1, col=1)
+            fig.add_trace(scatter(
+                x=days, y=predicted_all, mode='lines', name='Predicted Counterfactual',
+                line=dict(color='#1f77b4', width=2, dash='dash')
+            ), row=1, col=1)
+            fig.add_trace(scatter(
+                x=days, y=pointwise, mode='lines', name='Pointwise Effect',
+                line=dict(color='#1f77b4', width=2)
+            ), row=2, col=1)
+            fig.add_trace(scatter(
+                x=days, y=cumulative, mode='lines', name='Cumulative Effect',
+                line=dict(color='#1f77b4', width=2)
+            ), row=3, col=1)
+
+            # Intervention marker on every panel, zero baseline on the effect panels
+            for row in (1, 2, 3):
+                fig.add_vline(x=intervention_day, line_dash='dash', line_color='red', line_width=2, row=row, col=1)
+            for row in (2, 3):
+                fig.add_hline(y=0, line_color='black', line_width=1, row=row, col=1)
+
+            fig.update_yaxes(title_text='Value', row=1, col=1)
+            fig.update_yaxes(title_text='Effect', row=2, col=1)
+            fig.update_yaxes(title_text='Cumulative Effect', row=3, col=1)
+            fig.update_xaxes(title_text='Days', row=3, col=1)
+            fig.update_layout(
+                height=800,
+                hovermode='x unified',
+                template='plotly_white',
+                legend=dict(orientation='h', yanchor='bottom', y=1.04, x=0)
             )
-        
-        st.markdown("---")
-        
-        # Visualization (common for all methods)
-        st.subheader("Causal Visualization")
-        
-        fig, axes = plt.subplots(3, 1, figsize=(12, 10))
-        
-        days = np.arange(len(ci_data))
-        actual = ci_data['y'].values
-        predicted_all = inferences['preds'].values
-        
-        axes[0].plot(days, actual, 'k-', linewidth=2, label='Actual (y)')
-        axes[0].plot(days, predicted_all, 'b--', linewidth=2, label='Predicted Counterfactual')
-        axes[0].axvline(x=intervention_day, color='red', linestyle='--', linewidth=2, label='Intervention')
-        axes[0].set_ylabel('Value', fontsize=11)
-        axes[0].set_title('Original Data vs Predicted Counterfactual', fontsize=12, fontweight='bold')
-        axes[0].legend(loc='upper left', fontsize=10)
-        axes[0].grid(True, alpha=0.3)
-        
-        pointwise = actual - predicted_all
-        
-        axes[1].plot(days, pointwise, 'b-', linewidth=2, label='Pointwise Effect')
-        axes[1].axhline(y=0, color='black', linestyle='-', linewidth=1)
-        axes[1].axvline(x=intervention_day, color='red', linestyle='--', linewidth=2, label='Intervention')
-        axes[1].set_ylabel('Effect', fontsize=11)
-        axes[1].set_title('Pointwise Effect (Actual - Predicted)', fontsize=12, fontweight='bold')
-        axes[1].legend(loc='upper left', fontsize=10)
-        axes[1].grid(True, alpha=0.3)
-        
-        cumulative = np.zeros(len(ci_data))
-        cumulative[:intervention_day] = 0
-        cumulative[intervention_day:] = np.cumsum(pointwise[intervention_day:])
-        
-        axes[2].plot(days, cumulative, 'b-', linewidth=2, label='Cumulative Effect')
-        axes[2].axhline(y=0, color='black', linestyle='-', linewidth=1)
-        axes[2].axvline(x=intervention_day, color='red', linestyle='--', linewidth=2, label='Intervention')
-        axes[2].set_xlabel('Days', fontsize=11)
-        axes[2].set_ylabel('Cumulative Effect', fontsize=11)
-        axes[2].set_title(f'Cumulative Effect (Final: {cumulative[-1]:+.0f})', fontsize=12, fontweight='bold')
-        axes[2].legend(loc='upper left', fontsize=10)
-        axes[2].grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-        buf.seek(0)
-        st.image(buf, use_container_width=True)
-        plt.close()
-        
-    except Exception as e:
-        st.error(f"Error running analysis: {str(e)}")
-        st.info("The selected method encountered an issue. Please check the simulation results and try again.")
+
+            st.plotly_chart(fig, use_container_width=True)
+
+        except Exception as e:
+            st.error(f"Error running analysis: {str(e)}")
+            st.info("The selected method encountered an issue. Please check the simulation results and try again.")
+
+
+analysis_section(ci_data, intervention_day)
 
 st.markdown("---")
 
@@ -190,8 +258,7 @@ These checks validate whether the synthetic control is a good match and whether
 """)
 
 # Pre-period similarity
-pre_data = data[data['period'] == 'pre']
-correlation = pre_data['test_market'].corr(pre_data['control_market'])
+correlation = metrics['pre_corr']
 
 if correlation >= 0.85:
     status_sim = "🟢 High"
@@ -204,10 +271,7 @@ else:
     color_sim = "red"
 
 # Outlier detection
-post_data = data[data['period'] == 'post']
-differences = (post_data['test_market'] - post_data['control_market']).values
-z_scores = np.abs((differences - differences.mean()) / differences.std())
-outliers = np.sum(z_scores > 3)
+outliers = metrics['post_outliers']
 
 if outliers == 0:
     status_outliers = "🟢 None"
@@ -221,7 +285,7 @@ else:
 
 # RMSE check (if we calculated synthetic control fit)
 if 'synthetic_weights' in st.session_state and st.session_state['synthetic_weights']:
-    rmse_pct = st.session_state['synthetic_weights'].get('rmse', 0) / pre_data['test_market'].mean() * 100
+    rmse_pct = st.session_state['synthetic_weights'].get('rmse', 0) / metrics['pre_avg_test'] * 100
     
     if rmse_pct < 10:
         status_rmse = "🟢 Good"
@@ -1,19 +1,13 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from scipy.stats import norm
 from datetime import datetime
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
 import io
 
 st.set_page_config(page_title="Executive Summary", layout="wide")
 
 # Check if we have causal impact results
-if 'causal_impact' not in st.session_state or 'simulation_data' not in st.session_state:
+if 'ci_results' not in st.session_state or 'simulation_data' not in st.session_state:
     st.error("No causal analysis results found. Please complete the analysis first.")
     if st.button("← Go Back to Analysis"):
         st.switch_page("pages/4_📊_Causal_Analysis.py")
@@ -25,42 +19,38 @@ st.title("📈 Executive Summary")
 # RETRIEVE DATA FROM SESSION STATE
 # ==============================================================================
 
-ci = st.session_state['causal_impact']
 data = st.session_state['simulation_data']
 metadata = st.session_state['simulation_metadata']
+metrics = st.session_state['simulation_metrics']
 template = st.session_state['selected_template']
 test_market = st.session_state['test_market']
 control_market = st.session_state['control_market']
 use_synthetic = st.session_state.get('synthetic_weights') is not None
 control_label = "Synthetic Control" if use_synthetic else control_market
 
-# Extract metrics from CausalImpact
-inferences = ci.inferences
-post_start = 90
-actual_post = data[data['period'] == 'post']['test_market'].values
-predicted_post = inferences['preds'].iloc[post_start:].values
-pointwise_effects = actual_post - predicted_post
-point_est = np.nansum(pointwise_effects)
-avg_daily_effect = np.nanmean(pointwise_effects)
-post_mean = np.nanmean(actual_post)
-post_sum = np.nansum(actual_post)  # FIXED: Use nansum to ignore nan values
-pct_effect = (point_est / post_sum * 100) if post_sum != 0 else 0
+# Effect statistics computed once on the Causal Analysis page
+ci_results = st.session_state['ci_results']
+actual_post = ci_results['actual_post']
+predicted_post = ci_results['predicted_post']
+pointwise_effects = ci_results['pointwise_effects']
+point_est = ci_results['point_est']
+avg_daily_effect = ci_results['avg_daily_effect']
+post_mean = ci_results['post_mean']
+post_sum = ci_results['post_sum']
+pct_effect = ci_results['pct_effect']
 
 # Statistical significance
-pre_data = data[data['period'] == 'pre']
-post_data = data[data['period'] == 'post']
-pre_mean = data['test_market'].iloc[:90].mean()
-effect_se = np.nanstd(pointwise_effects) / np.sqrt(len(pointwise_effects))
-z_score = point_est / effect_se if effect_se > 0 else 0
-# FIXED: Use proper normal CDF for p-value calculation
-p_value = 2 * (1 - norm.cdf(abs(z_score)))
+pre_mean = metrics['pre_avg_test']
+effect_se = ci_results['effect_se']
+z_score = ci_results['z_score']
+p_value = ci_results['p_value']
 
 # Lightweight BI assumptions to show business-facing KPIs
 assumed_conv_rate = 0.03  # 3% conversion rate
 assumed_aov = 60  # $60 average order value
 assumed_rps = assumed_conv_rate * assumed_aov
 
-pre_sessions = pre_data['test_market'].sum()
+pre_sessions = metrics['pre_sum_test']
 post_sessions = post_sum
 
 inc_sessions = np.nan_to_num(point_est, nan=0.0)
@@ -89,6 +79,52 @@ st.info(
     """
 )
 
+DECISION_FRAMEWORK_MD = """
+| Scenario | Condition | Recommendation | Action |
+|----------|-----------|-----------------|--------|
+| **Strong Win** | Effect > 5% AND p < 0.05 | ✅ Ship | Implement change immediately |
+| **Likely Win** | Effect > 2% AND p < 0.10 | 🔄 Continue Testing | Run longer or expand to more markets |
+| **Inconclusive** | Effect 0-2% OR p ≥ 0.10 | 🤔 Investigate | Check for confounders or data quality |
+| **Loss/Harm** | Effect < 0% AND p < 0.10 | ❌ Don't Ship | Revert and investigate causes |
+"""
+
+
+@st.cache_data
+def build_impact_markdown(pre_mean, post_mean, avg_daily_effect):
+    """Business impact projection text for the given daily effect."""
+    return f"""
+**Assuming company-wide rollout:**
+
+- **Current Daily Traffic:** ~{pre_mean:,.0f} sessions/day (est. from test market)
+- **Estimated Daily Lift:** {avg_daily_effect:+,.0f} sessions ({(avg_daily_effect/post_mean*100):+.1f}%)
+- **Monthly Impact (30 days):** {avg_daily_effect * 30:+,.0f} additional sessions
+- **Annual Impact (365 days):** {avg_daily_effect * 365:+,.0f} additional sessions
+
+**Typical Monetization Scenarios:**
+- @ $2/session: ${avg_daily_effect * 365 * 2:+,.0f}/year
+- @ $5/session: ${avg_daily_effect * 365 * 5:+,.0f}/year
+- @ $10/session: ${avg_daily_effect * 365 * 10:+,.0f}/year
+"""
+
+
+def decide(pct_effect, p_value):
+    """
+    Ship/continue/stop recommendation from effect size and significance.
+
+    Returns (decision, color, reason) where reason is one of 'harmful',
+    'ship', 'continue' or 'insufficient'. Both the metric card and the
+    debug breakdown render from this so they cannot disagree.
+    """
+    # IMPORTANT: Negative effects that are significant should be "Don't Ship" (harmful)
+    if pct_effect < 0 and p_value < 0.10:
+        return "❌ Don't Ship", "red", 'harmful'
+    if pct_effect > 5 and p_value < 0.05:
+        return "✅ Ship", "green", 'ship'
+    if pct_effect > 2 and p_value < 0.10:
+        return "🔄 Continue", "blue", 'continue'
+    return "❌ Don't Ship", "red", 'insufficient'
+
+
 # ==============================================================================
 # SECTION A: KEY METRICS SUMMARY
 # ==============================================================================
@@ -122,20 +158,7 @@ with col3:
     )
 
 with col4:
-    # Decision based on effect size and significance
-    # IMPORTANT: Negative effects that are significant should be "Don't Ship" (harmful)
-    if pct_effect < 0 and p_value < 0.10:
-        decision = "❌ Don't Ship"
-        color = "red"
-    elif pct_effect > 5 and p_value < 0.05:
-        decision = "✅ Ship"
-        color = "green"
-    elif pct_effect > 2 and p_value < 0.10:
-        decision = "🔄 Continue"
-        color = "blue"
-    else:
-        decision = "❌ Don't Ship"
-        color = "red"
+    decision, color, decision_reason = decide(pct_effect, p_value)
     
     st.metric(
         "Recommendation",
@@ -183,8 +206,8 @@ with st.expander("🔍 Debug: Decision Logic Breakdown", expanded=False):
     st.markdown("---")
     st.markdown(f"**Final Decision: {decision}**")
     
-    if decision == "❌ Don't Ship":
-        if pct_effect < 0 and p_value < 0.10:
+    if decision_reason in ('harmful', 'insufficient'):
+        if decision_reason == 'harmful':
             st.error(f"""
             **Why "Don't Ship"? NEGATIVE IMPACT!**
             
@@ -213,7 +236,7 @@ with st.expander("🔍 Debug: Decision Logic Breakdown", expanded=False):
             - If p-value is high: Try running the test longer for more data
             - Check the validity diagnostics on Page 4 for data quality issues
             """)
-    elif decision == "🔄 Continue":
+    elif decision_reason == 'continue':
         st.info(f"""
         **Why "Continue"?**
         
@@ -267,15 +290,23 @@ with col3:
 
 st.caption("Note: These KPIs are mock conversions/revenue for BI storytelling. Assumptions: 3% CVR, $60 AOV.")
 
-guardrail_df = pd.DataFrame({
-    'Metric': ['Sessions (Post)', 'Incremental Sessions', 'Bounce Rate (Pre)', 'Bounce Rate (Post)'],
-    'Value': [
-        f"{post_sessions:,.0f}",
-        f"{inc_sessions:+,.0f}",
-        f"{bounce_rate_pre*100:.1f}%",
-        f"{bounce_rate_post*100:.1f}%"
-    ]
-})
+@st.cache_data
+def build_guardrail_table(post_sessions, inc_sessions, bounce_rate_pre, bounce_rate_post):
+    """Formatted BI guardrail table; cached since its inputs are fixed per analysis."""
+    return pd.DataFrame({
+        'Metric': ['Sessions (Post)', 'Incremental Sessions', 'Bounce Rate (Pre)', 'Bounce Rate (Post)'],
+        'Value': [
+            f"{post_sessions:,.0f}",
+            f"{inc_sessions:+,.0f}",
+            f"{bounce_rate_pre*100:.1f}%",
+            f"{bounce_rate_post*100:.1f}%"
+        ]
+    })
+
+
+guardrail_df = build_guardrail_table(
+    float(post_sessions), float(inc_sessions), float(bounce_rate_pre), float(bounce_rate_post)
+)
 
 st.dataframe(guardrail_df, use_container_width=True, hide_index=True)
 
@@ -287,40 +318,51 @@ st.markdown("---")
 
 st.subheader("📋 Detailed Metrics")
 
-metrics_table = pd.DataFrame({
-    'Metric': [
-        'Pre-Period Mean (Test)',
-        'Post-Period Mean (Test)',
-        'Absolute Lift',
-        'Relative Lift %',
-        'Post-Period Total (Test)',
-        'Post-Period Total (Predicted)',
-        'Estimated Effect',
-        'Effect %',
-        'Avg Daily Effect',
-        'Daily Effect %',
-        'Post-Period Days',
-        'P-Value (2-sided)',
-        'Z-Score',
-        'Effect Std Dev'
-    ],
-    'Value': [
-        f"{pre_mean:.0f}",
-        f"{post_mean:.0f}",
-        f"{(post_mean - pre_mean):+.0f}",
-                f"{((post_mean - pre_mean) / pre_mean * 100):+.1f}%",
-                f"{post_sum:.0f}",
-                f"{predicted_post.sum():.0f}",
-                f"{point_est:+.0f}",
-                f"{pct_effect:+.1f}%",
-                f"{avg_daily_effect:+.0f}",
-                f"{(avg_daily_effect / post_mean * 100):+.1f}%",
-                f"{len(actual_post)}",
-                f"{p_value:.4f}",
-                f"{z_score:.4f}",
-                f"{np.nanstd(pointwise_effects):.0f}"
-            ]
-})
+@st.cache_data
+def build_metrics_table(pre_mean, post_mean, post_sum, predicted_sum, point_est, pct_effect,
+                        avg_daily_effect, n_days, p_value, z_score, effect_sd):
+    """Formatted detailed-metrics table; cached since its inputs are fixed per analysis."""
+    return pd.DataFrame({
+        'Metric': [
+            'Pre-Period Mean (Test)',
+            'Post-Period Mean (Test)',
+            'Absolute Lift',
+            'Relative Lift %',
+            'Post-Period Total (Test)',
+            'Post-Period Total (Predicted)',
+            'Estimated Effect',
+            'Effect %',
+            'Avg Daily Effect',
+            'Daily Effect %',
+            'Post-Period Days',
+            'P-Value (2-sided)',
+            'Z-Score',
+            'Effect Std Dev'
+        ],
+        'Value': [
+            f"{pre_mean:.0f}",
+            f"{post_mean:.0f}",
+            f"{(post_mean - pre_mean):+.0f}",
+            f"{((post_mean - pre_mean) / pre_mean * 100):+.1f}%",
+            f"{post_sum:.0f}",
+            f"{predicted_sum:.0f}",
+            f"{point_est:+.0f}",
+            f"{pct_effect:+.1f}%",
+            f"{avg_daily_effect:+.0f}",
+            f"{(avg_daily_effect / post_mean * 100):+.1f}%",
+            f"{n_days}",
+            f"{p_value:.4f}",
+            f"{z_score:.4f}",
+            f"{effect_sd:.0f}"
+        ]
+    })
+
+
+metrics_table = build_metrics_table(
+    float(pre_mean), float(post_mean), float(post_sum), float(predicted_post.sum()),
+    float(point_est), float(pct_effect), float(avg_daily_effect), len(actual_post),
+    float(p_value), float(z_score), float(np.nanstd(pointwise_effects))
+)
 
 st.dataframe(metrics_table, use_container_width=True, hide_index=True)
 
@@ -332,14 +374,7 @@ st.markdown("---")
 
 st.subheader("🎯 Decision Framework")
 
-st.markdown("""
-| Scenario | Condition | Recommendation | Action |
-|----------|-----------|-----------------|--------|
-| **Strong Win** | Effect > 5% AND p < 0.05 | ✅ Ship | Implement change immediately |
-| **Likely Win** | Effect > 2% AND p < 0.10 | 🔄 Continue Testing | Run longer or expand to more markets |
-| **Inconclusive** | Effect 0-2% OR p ≥ 0.10 | 🤔 Investigate | Check for confounders or data quality |
-| **Loss/Harm** | Effect < 0% AND p < 0.10 | ❌ Don't Ship | Revert and investigate causes |
-""")
+st.markdown(DECISION_FRAMEWORK_MD)
 
 st.markdown("---")
 
@@ -349,19 +384,7 @@ st.markdown("---")
 
 st.subheader("💰 Business Impact Projection")
 
-st.markdown(f"""
-**Assuming company-wide rollout:**
-
-- **Current Daily Traffic:** ~{pre_mean:,.0f} sessions/day (est. from test market)
-- **Estimated Daily Lift:** {avg_daily_effect:+,.0f} sessions ({(avg_daily_effect/post_mean*100):+.1f}%)
-- **Monthly Impact (30 days):** {avg_daily_effect * 30:+,.0f} additional sessions
-- **Annual Impact (365 days):** {avg_daily_effect * 365:+,.0f} additional sessions
-
-**Typical Monetization Scenarios:**
-- @ $2/session: ${avg_daily_effect * 365 * 2:+,.0f}/year
-- @ $5/session: ${avg_daily_effect * 365 * 5:+,.0f}/year
-- @ $10/session: ${avg_daily_effect * 365 * 10:+,.0f}/year
-""")
+st.markdown(build_impact_markdown(float(pre_mean), float(post_mean), float(avg_daily_effect)))
 
 st.markdown("---")
 
@@ -373,7 +396,7 @@ st.subheader("✓ Validity Checks")
 
 # From the causal analysis results
 pre_corr = metadata.get('control_correlation', 0.95)
-pre_diff = abs((pre_data['test_market'].mean() - pre_data['control_market'].mean())) / pre_data['control_market'].mean()
+pre_diff = abs(metrics['pre_avg_test'] - metrics['pre_avg_control']) / metrics['pre_avg_control']
 
 col1, col2, col3 = st.columns(3)
 
@@ -395,8 +418,8 @@ with col2:
 
 with col3:
     # Calculate RMSE of pre-period predictions
-    pre_predict = inferences['preds'].iloc[:90].mean()
-    pre_actual = data['test_market'].iloc[:90].mean()
+    pre_predict = ci_results['pre_predicted_mean']
+    pre_actual = metrics['pre_avg_test']
     rmse_pct = abs(pre_predict - pre_actual) / pre_actual * 100
     
     if rmse_pct < 5:
@@ -414,12 +437,13 @@ st.markdown("---")
 
 st.subheader("📄 Export Report")
 
-def generate_pdf():
-    """Generate a PDF report of the executive summary."""
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
+@st.cache_resource
+def pdf_styles():
+    """Report stylesheet, custom title/heading styles and key-metrics table style, built once per process."""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
     
-    # Styles
     styles = getSampleStyleSheet()
     title_style = ParagraphStyle(
         'CustomTitle',
@@ -436,6 +460,30 @@ def generate_pdf():
         spaceAfter=12,
         spaceBefore=12
     )
+    key_table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+    return styles, title_style, heading_style, key_table_style
+
+
+def generate_pdf():
+    """Generate a PDF report of the executive summary."""
+    # ReportLab is only needed when a report is requested, so it is imported
+    # here rather than on every page load
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
+    
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
+    styles, title_style, heading_style, key_table_style = pdf_styles()
     
     elements = []
     
@@ -470,16 +518,7 @@ def generate_pdf():
     ]
     
     key_table = Table(key_metrics_data, colWidths=[3*inch, 3*inch])
-    key_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f77b4')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
+    key_table.setStyle(key_table_style)
     elements.append(key_table)
     elements.append(Spacer(1, 0.3*inch))
     
@@ -488,16 +527,21 @@ def generate_pdf():
     buffer.seek(0)
     return buffer
 
-# Generate and offer download
-if st.button("📥 Download PDF Report", use_container_width=True, type="primary"):
-    pdf_buffer = generate_pdf()
-    st.download_button(
-        label="💾 Save PDF",
-        data=pdf_buffer,
-        file_name=f"Executive_Summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-        mime="application/pdf",
-        use_container_width=True
-    )
+# Generate and offer download; as a fragment the button only reruns this
+# section instead of re-rendering the whole summary
+@st.fragment
+def export_section():
+    if st.button("📥 Download PDF Report", use_container_width=True, type="primary"):
+        pdf_buffer = generate_pdf()
+        st.download_button(
+            label="💾 Save PDF",
+            data=pdf_buffer,
+            file_name=f"Executive_Summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+            mime="application/pdf",
+            use_container_width=True
+        )
+
+export_section()
 
 st.markdown("---")
 
@@ -1,13 +1,96 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from causalimpact import CausalImpact
-from src.data_generator import StochasticSEOGenerator
+from src.batch_runner import experiment_seed, fit_experiment_group, generate_batch_series, summarize_batch
 import time
 
 st.set_page_config(page_title="Batch Runner", layout="wide")
 
+# Upper bound on memoized experiment results kept per server process
+EXPERIMENT_CACHE_SIZE = 512
+# Rows rendered per results table; the CSV export always has every row
+MAX_PREVIEW_ROWS = 500
+# Minimum seconds between progress bar / status updates during a batch
+PROGRESS_INTERVAL_S = 0.2
+
+# Results stay numeric; formatting happens in the browser via column_config
+# instead of pre-formatted strings or a pandas Styler
+RESULTS_COLUMN_CONFIG = {
+    'estimated_effect': st.column_config.NumberColumn("Estimated Effect", format="%+.0f"),
+    'effect_pct': st.column_config.NumberColumn("Effect %", format="%+.1f%%"),
+    'p_value': st.column_config.NumberColumn("P-Value", format="%.4f"),
+    'pre_corr': st.column_config.NumberColumn("Pre-Corr", format="%.3f")
+}
+RESULTS_DISPLAY_COLUMNS = [
+    'experiment_id', 'test_market', 'control_market', 'planned_effect',
+    'estimated_effect', 'effect_pct', 'p_value', 'pre_corr', 'confounders'
+]
+
+
+@st.cache_resource
+def experiment_cache():
+    """
+    Process-wide memo of finished batch experiments, keyed by their config.
+    
+    A plain dict (rather than st.cache_data on the worker) so the batch loop
+    can see which configs are already done and only send the rest to the
+    process pool.
+    """
+    return {}
+
+
+def show_preview(df):
+    """Render at most MAX_PREVIEW_ROWS rows of `df`, noting when it is truncated."""
+    st.dataframe(
+        df.head(MAX_PREVIEW_ROWS),
+        use_container_width=True,
+        hide_index=True,
+        column_config=RESULTS_COLUMN_CONFIG
+    )
+    if len(df) > MAX_PREVIEW_ROWS:
+        st.caption(f"Showing first {MAX_PREVIEW_ROWS} of {len(df)}. Download CSV for full results.")
+
+
+@st.cache_data
+def results_csv(df):
+    """CSV export of a batch results frame."""
+    return df.to_csv(index=False).encode()
+
+
+@st.cache_data
+def effect_stats_table(effect_pct):
+    """Distribution summary of a batch's effect sizes (failed runs excluded)."""
+    valid_effects = effect_pct.dropna()
+    return pd.DataFrame({
+        'Statistic': ['Min', 'Q1 (25%)', 'Median', 'Q3 (75%)', 'Max', 'Mean', 'Std Dev'],
+        'Value': [
+            f"{valid_effects.min():+.1f}%",
+            f"{valid_effects.quantile(0.25):+.1f}%",
+            f"{valid_effects.median():+.1f}%",
+            f"{valid_effects.quantile(0.75):+.1f}%",
+            f"{valid_effects.max():+.1f}%",
+            f"{valid_effects.mean():+.1f}%",
+            f"{valid_effects.std():+.1f}%"
+        ]
+    })
+
+
+@st.cache_data
+def significance_table(p_value):
+    """Count of a batch's experiments per significance level."""
+    # Bucket every p-value in one pass; NaN (failed runs) gets its own bucket
+    sig_labels = ['p < 0.05 (Very Sig.)', 'p < 0.10 (Sig.)', 'p >= 0.10 (Not Sig.)', 'N/A (Error)']
+    p_values = p_value.to_numpy()
+    buckets = np.where(np.isnan(p_values), 3, np.searchsorted([0.05, 0.10], p_values, side='right'))
+    return pd.DataFrame({
+        'Significance Level': sig_labels,
+        'Count': np.bincount(buckets, minlength=4)
+    })
+
+
 st.title("🚀 Batch Runner - Unavailable")
 st.warning("Batch Runner is currently disabled. Please return to the main flow.")
 
@@ -69,8 +152,6 @@ st.subheader("▶️ Run Batch Experiments")
 
 if st.button("🚀 Start Batch Processing", use_container_width=True, type="primary"):
     with st.spinner("Running batch experiments..."):
-        # Initialize results storage
-        batch_results = []
         progress_bar = st.progress(0)
         status_text = st.empty()
         
@@ -80,9 +161,7 @@ if st.button("🚀 Start Batch Processing", use_container_width=True, type="prim
             'markets': ['Market_A', 'Market_B', 'Market_C', 'Market_D']
         })
         
-        data_gen = StochasticSEOGenerator(seed=42)
         total_runs = num_experiments * len(effect_sizes) if effect_sizes else num_experiments
-        run_count = 0
         
         # Generate market pairs
         available_markets = template.get('markets', [
@@ -90,6 +169,8 @@ if st.button("🚀 Start Batch Processing", use_container_width=True, type="prim
             'Market_E', 'Market_F', 'Market_G', 'Market_H'
         ])
         
+        # One config per (experiment, effect size); each run is independent
+        configs = []
         for exp_idx in range(num_experiments):
             # Pick unique markets for this experiment
             market_idx_1 = (exp_idx * 2) % len(available_markets)
@@ -101,98 +182,75 @@ if st.button("🚀 Start Batch Processing", use_container_width=True, type="prim
             effect_list = effect_sizes if effect_sizes else [5]
             
             for effect_pct in effect_list:
-                run_count += 1
-                status_text.text(f"Running experiment {run_count}/{total_runs}: {test_mkt} vs {control_mkt}, effect={effect_pct}%")
-                
-                try:
-                    # Generate data with independent random seed
-                    seed = int(datetime.now().timestamp() * 1000) % 100000 + run_count
-                    data_gen = StochasticSEOGenerator(seed=seed)
-                    
-                    # Randomly select confounders
-                    confounders = None
-                    if include_confounders and np.random.rand() > 0.5:
-                        confounder_list = ['algorithm_update', 'seasonality_spike', 'tracking_break']
-                        confounders = [np.random.choice(confounder_list)]
-                    
-                    result = data_gen.generate_experiment_data(
-                        test_market=test_mkt,
-                        control_market=control_mkt,
-                        pre_period_days=90,
-                        post_period_days=experiment_duration,
-                        mde_pct=effect_pct / 100,
-                        effect_shape='step',
-                        confounders=confounders
-                    )
-                    
-                    data = result['data']
-                    metadata = result['metadata']
-                    
-                    # Prep data
-                    ci_data = data[['test_market', 'control_market']].copy()
-                    ci_data.columns = ['y', 'X']
-                    ci_data = ci_data.reset_index(drop=True)
-                    post_start = 90
-
-                    # Run CausalImpact
-                    ci = CausalImpact(
-                        ci_data,
-                        pre_period=[0, post_start - 1],
-                        post_period=[post_start, len(ci_data) - 1]
-                    )
-                    inferences = ci.inferences
-                    predicted_post = inferences['preds'].iloc[post_start:].values
-
-                    actual_post = ci_data['y'].iloc[post_start:].values
-                    pointwise_effects = actual_post - predicted_post
-                    point_est = np.nansum(pointwise_effects)
-                    avg_daily = np.nanmean(pointwise_effects)
-                    post_sum = actual_post.sum()
-                    pct_effect = (point_est / post_sum * 100) if post_sum != 0 else 0
-
-                    # Statistical test
-                    effect_se = np.nanstd(pointwise_effects) / np.sqrt(len(pointwise_effects))
-                    z_score = point_est / effect_se if effect_se > 0 else 0
-                    p_value = 2 * (1 - np.exp(-abs(z_score) / np.sqrt(2 * np.pi)))
-                    
-                    batch_results.append({
-                        'experiment_id': f"EXP_{exp_idx + 1}_{effect_pct}pct",
-                        'test_market': test_mkt,
-                        'control_market': control_mkt,
-                        'planned_effect': effect_pct,
-                        'estimated_effect': point_est,
-                        'effect_pct': pct_effect,
-                        'avg_daily': avg_daily,
-                        'p_value': p_value,
-                        'z_score': z_score,
-                        'days': len(actual_post),
-                        'pre_corr': metadata.get('control_correlation', 0.95),
-                        'confounders': ', '.join(confounders) if confounders else 'None'
-                    })
-                    
-                except Exception as e:
-                    batch_results.append({
-                        'experiment_id': f"EXP_{exp_idx + 1}_{effect_pct}pct",
-                        'test_market': test_mkt,
-                        'control_market': control_mkt,
-                        'planned_effect': effect_pct,
-                        'estimated_effect': np.nan,
-                        'effect_pct': np.nan,
-                        'avg_daily': np.nan,
-                        'p_value': np.nan,
-                        'z_score': np.nan,
-                        'days': experiment_duration,
-                        'pre_corr': np.nan,
-                        'confounders': f'Error: {str(e)[:30]}'
-                    })
-                
-                # Update progress
-                progress_bar.progress(run_count / total_runs)
+                configs.append({
+                    'exp_idx': exp_idx,
+                    'test_market': test_mkt,
+                    'control_market': control_mkt,
+                    'effect_pct': effect_pct,
+                    # Reproducible seed, shared by the effect sizes of a pair
+                    'seed': experiment_seed(exp_idx, test_mkt, control_mkt),
+                    'post_period_days': experiment_duration,
+                    'include_confounders': include_confounders
+                })
+        
+        # Identical configs give identical results, so only fit the ones not
+        # already in the memo
+        cache = experiment_cache()
+        keys = [tuple(sorted(cfg.items())) for cfg in configs]
+        pending = [(key, cfg) for key, cfg in zip(keys, configs) if key not in cache]
+        run_count = len(configs) - len(pending)
+        progress_bar.progress(run_count / total_runs)
+        last_update = time.monotonic()
+        
+        # Phase 1: generate every pending series into one array (cheap).
+        # Phase 2: CausalImpact fits are CPU-bound and independent across
+        # experiments, so fan them out across processes, one group per
+        # experiment so its effect sizes share a fit; map() keeps results
+        # in submission order
+        fresh = {}
+        if pending:
+            pending_configs = [cfg for _, cfg in pending]
+            series, details = generate_batch_series(pending_configs)
+            groups = {}
+            for i, cfg in enumerate(pending_configs):
+                groups.setdefault(cfg['exp_idx'], []).append(i)
+            group_tasks = [
+                [(pending_configs[i], series[i], details[i]) for i in idxs]
+                for idxs in groups.values()
+            ]
+            
+            max_workers = max(1, min(os.cpu_count() or 1, len(group_tasks)))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                group_results = executor.map(fit_experiment_group, group_tasks, chunksize=1)
+                for idxs, results in zip(groups.values(), group_results):
+                    for i, result in zip(idxs, results):
+                        key = pending[i][0]
+                        fresh[key] = result
+                        # Failed runs are not memoized so the next batch retries them
+                        if not result['confounders'].startswith('Error'):
+                            cache[key] = result
+                    run_count += len(idxs)
+                    # Every progress call is a message to the browser, so
+                    # update at most every PROGRESS_INTERVAL_S (and at the end)
+                    now = time.monotonic()
+                    if run_count == total_runs or now - last_update >= PROGRESS_INTERVAL_S:
+                        status_text.text(
+                            f"Completed experiment {run_count}/{total_runs}: "
+                            f"{result['test_market']} vs {result['control_market']}"
+                        )
+                        progress_bar.progress(run_count / total_runs)
+                        last_update = now
+        
+        batch_results = [fresh[key] if key in fresh else cache[key] for key in keys]
+        
+        # Drop the oldest entries once the memo outgrows its bound
+        for key in list(cache)[:max(0, len(cache) - EXPERIMENT_CACHE_SIZE)]:
+            del cache[key]
         
         status_text.text("✅ Batch processing complete!")
         
         # Store results in session
-        st.session_state['batch_results'] = pd.DataFrame(batch_results)
+        st.session_state['batch_results'] = summarize_batch(batch_results)
         
         time.sleep(0.5)
         st.rerun()
@@ -208,21 +266,11 @@ if 'batch_results' in st.session_state:
     
     results_df = st.session_state['batch_results'].copy()
     
-    # Format for display
-    display_df = results_df.copy()
-    display_df['Estimated Effect'] = display_df['estimated_effect'].apply(lambda x: f"{x:+.0f}" if pd.notna(x) else "N/A")
-    display_df['Effect %'] = display_df['effect_pct'].apply(lambda x: f"{x:+.1f}%" if pd.notna(x) else "N/A")
-    display_df['Avg Daily'] = display_df['avg_daily'].apply(lambda x: f"{x:+.0f}" if pd.notna(x) else "N/A")
-    display_df['P-Value'] = display_df['p_value'].apply(lambda x: f"{x:.4f}" if pd.notna(x) else "N/A")
-    display_df['Z-Score'] = display_df['z_score'].apply(lambda x: f"{x:.2f}" if pd.notna(x) else "N/A")
-    display_df['Pre-Corr'] = display_df['pre_corr'].apply(lambda x: f"{x:.3f}" if pd.notna(x) else "N/A")
-    
-    show_cols = [
-        'experiment_id', 'test_market', 'control_market', 'planned_effect',
-        'Estimated Effect', 'Effect %', 'P-Value', 'Pre-Corr', 'confounders'
-    ]
+    # Display frame holds only the shown columns; values stay numeric and
+    # are formatted by RESULTS_COLUMN_CONFIG
+    display_df = results_df[RESULTS_DISPLAY_COLUMNS]
     
-    st.dataframe(display_df[show_cols], use_container_width=True, hide_index=True)
+    show_preview(display_df)
     
     st.markdown("---")
     
@@ -263,11 +311,9 @@ if 'batch_results' in st.session_state:
     
     if len(winners) > 0:
         st.markdown("**Winning Experiments:**")
-        winners_display = winners[show_cols].copy()
-        winners_display['Estimated Effect'] = winners_display['estimated_effect'].apply(lambda x: f"{x:+.0f}")
-        winners_display['Effect %'] = winners_display['effect_pct'].apply(lambda x: f"{x:+.1f}%")
-        winners_display['P-Value'] = winners_display['p_value'].apply(lambda x: f"{x:.4f}")
-        st.dataframe(winners_display[show_cols], use_container_width=True, hide_index=True)
+        # Winners are a subset of the rows already formatted above
+        winners_display = display_df[results_df['winner']]
+        show_preview(winners_display)
     else:
         st.warning("No winning experiments in this batch.")
     
@@ -284,36 +330,12 @@ if 'batch_results' in st.session_state:
     with col1:
         st.markdown("**Effect Size Distribution**")
         
-        valid_effects = results_df['effect_pct'].dropna()
-        stats_data = {
-            'Statistic': ['Min', 'Q1 (25%)', 'Median', 'Q3 (75%)', 'Max', 'Mean', 'Std Dev'],
-            'Value': [
-                f"{valid_effects.min():+.1f}%",
-                f"{valid_effects.quantile(0.25):+.1f}%",
-                f"{valid_effects.median():+.1f}%",
-                f"{valid_effects.quantile(0.75):+.1f}%",
-                f"{valid_effects.max():+.1f}%",
-                f"{valid_effects.mean():+.1f}%",
-                f"{valid_effects.std():+.1f}%"
-            ]
-        }
-        st.dataframe(pd.DataFrame(stats_data), use_container_width=True, hide_index=True)
+        st.dataframe(effect_stats_table(results_df['effect_pct']), use_container_width=True, hide_index=True)
     
     with col2:
         st.markdown("**Statistical Significance Distribution**")
         
-        sig_levels = {
-            'p < 0.05 (Very Sig.)': len(results_df[results_df['p_value'] < 0.05]),
-            'p < 0.10 (Sig.)': len(results_df[(results_df['p_value'] >= 0.05) & (results_df['p_value'] < 0.10)]),
-            'p >= 0.10 (Not Sig.)': len(results_df[results_df['p_value'] >= 0.10]),
-            'N/A (Error)': len(results_df[results_df['p_value'].isna()])
-        }
-        
-        sig_df = pd.DataFrame({
-            'Significance Level': list(sig_levels.keys()),
-            'Count': list(sig_levels.values())
-        })
-        st.dataframe(sig_df, use_container_width=True, hide_index=True)
+        st.dataframe(significance_table(results_df['p_value']), use_container_width=True, hide_index=True)
     
     st.markdown("---")
     
@@ -323,8 +345,8 @@ if 'batch_results' in st.session_state:
     
     st.subheader("💾 Export Results")
     
-    # Prepare CSV
-    csv_buffer = results_df.to_csv(index=False)
+    # Prepare CSV (serialized once per batch, not on every rerun)
+    csv_buffer = results_csv(results_df)
     
     col1, col2 = st.columns(2)
     
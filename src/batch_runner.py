@@ -0,0 +1,223 @@
+import hashlib
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Tuple
+from scipy.stats import norm
+
+from src.data_generator import StochasticSEOGenerator
+
+
+PRE_PERIOD_DAYS = 90
+CONFOUNDER_TYPES = ['algorithm_update', 'seasonality_spike', 'tracking_break']
+
+def experiment_seed(exp_idx: int, test_market: str, control_market: str) -> int:
+    """
+    Stable seed for one batch experiment's market pair.
+    
+    Derived from the experiment's identity rather than the clock so reruns of
+    the same batch reproduce (and can reuse) earlier results. blake2b is used
+    because the builtin hash() is randomized per process. The effect size is
+    deliberately left out: every effect size of a pair then sees the same
+    noise, so they are directly comparable and share one CausalImpact fit.
+    """
+    key = f"{exp_idx}|{test_market}|{control_market}".encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=4).digest(), 'little')
+
+
+def generate_batch_series(configs: List[Dict[str, Any]]) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    """
+    Generate the test/control series for every batch experiment up front.
+    
+    Configs that share a seed (the effect sizes of one market pair) are
+    generated together: one set of random draws, with the test market built
+    for all of their effect sizes at once. A result still depends only on
+    its own config, not on what else is in the batch. The series land in one
+    preallocated array that is then sliced per fit.
+    
+    Args:
+        configs: Dicts with keys exp_idx, test_market, control_market,
+            effect_pct, seed, post_period_days and include_confounders.
+            All configs in a batch share post_period_days.
+    
+    Returns:
+        Tuple of (series, details): series has shape (n_configs, n_days, 2)
+        holding test (y) and control (X); details holds pre_corr,
+        confounders and error (None unless generation failed) per config
+    """
+    n_days = PRE_PERIOD_DAYS + (configs[0]['post_period_days'] if configs else 0)
+    series = np.full((len(configs), n_days, 2), np.nan)
+    details = [None] * len(configs)
+    
+    groups = {}
+    for i, config in enumerate(configs):
+        groups.setdefault((config['seed'], config['include_confounders']), []).append(i)
+    
+    for (seed, include_confounders), idxs in groups.items():
+        confounders = None
+        try:
+            gen = StochasticSEOGenerator(seed=seed)
+            
+            # Randomly select confounders
+            if include_confounders and gen.rng.random() > 0.5:
+                confounders = [gen.rng.choice(CONFOUNDER_TYPES)]
+            
+            result = gen.generate_experiment_series(
+                pre_period_days=PRE_PERIOD_DAYS,
+                post_period_days=configs[idxs[0]]['post_period_days'],
+                mde_pct=np.array([configs[i]['effect_pct'] for i in idxs]) / 100,
+                effect_shape='step',
+                confounders=confounders
+            )
+            series[idxs, :, 0] = result['test_market']
+            series[idxs, :, 1] = result['control_market']
+            detail = {
+                'pre_corr': result['control_correlation'],
+                'confounders': confounders,
+                'error': None
+            }
+        except Exception as e:
+            detail = {'pre_corr': np.nan, 'confounders': confounders, 'error': str(e)}
+        
+        for i in idxs:
+            details[i] = detail
+    
+    return series, details
+
+
+def fit_experiment_group(tasks: List[Tuple[Dict[str, Any], np.ndarray, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Estimate the effect of a group of batch experiments with CausalImpact.
+    
+    The counterfactual only depends on the pre-period test series and the
+    control series, so experiments that share those (the effect sizes of one
+    market pair, which share a seed) are fitted once and only differ in the
+    post-period actuals they are compared against.
+    
+    Kept at module level in src/ (rather than inside the Batch Runner page)
+    so it can be pickled and dispatched to worker processes.
+    
+    Args:
+        tasks: List of (config, series, detail) tuples, as produced by
+            generate_batch_series
+    
+    Returns:
+        Raw result rows in task order; pass a list of these to
+        summarize_batch. If a run fails, 'pointwise_effects' is None and the
+        error is recorded under 'confounders'.
+    """
+    # Deferred: causalimpact pulls in a heavy modelling stack, which the
+    # Batch Runner page should not pay for just by importing this module
+    from causalimpact import CausalImpact
+    
+    post_start = PRE_PERIOD_DAYS
+    fitted = {}
+    rows = []
+    
+    for config, series, detail in tasks:
+        effect_pct = config['effect_pct']
+        row = {
+            'experiment_id': f"EXP_{config['exp_idx'] + 1}_{effect_pct}pct",
+            'test_market': config['test_market'],
+            'control_market': config['control_market'],
+            'planned_effect': effect_pct
+        }
+        
+        try:
+            if detail['error'] is not None:
+                raise RuntimeError(detail['error'])
+            
+            fit_key = series[:post_start, 0].tobytes() + series[:, 1].tobytes()
+            if fit_key not in fitted:
+                ci_data = pd.DataFrame({'y': series[:, 0], 'X': series[:, 1]})
+                
+                # Run CausalImpact
+                ci = CausalImpact(
+                    ci_data,
+                    pre_period=[0, post_start - 1],
+                    post_period=[post_start, len(ci_data) - 1]
+                )
+                fitted[fit_key] = ci.inferences['preds'].to_numpy()[post_start:]
+            predicted_post = fitted[fit_key]
+            actual_post = series[post_start:, 0]
+            confounders = detail['confounders']
+            
+            # Effect statistics are computed for the whole batch at once in
+            # summarize_batch, so only the raw pointwise effects are returned
+            row.update({
+                'pointwise_effects': actual_post - predicted_post,
+                'post_sum': actual_post.sum(),
+                'days': len(actual_post),
+                'pre_corr': detail['pre_corr'],
+                'confounders': ', '.join(confounders) if confounders else 'None'
+            })
+        
+        except Exception as e:
+            row.update({
+                'pointwise_effects': None,
+                'post_sum': np.nan,
+                'days': config['post_period_days'],
+                'pre_corr': np.nan,
+                'confounders': f'Error: {str(e)[:30]}'
+            })
+        
+        rows.append(row)
+    
+    return rows
+
+
+def summarize_batch(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Build the batch results table from raw fit_experiment_group rows.
+    
+    The pointwise effects of all runs are stacked into one NaN-padded
+    (n_runs, max_days) matrix so every statistic is a single reduction
+    along axis 1. Failed runs are all-NaN rows and end up with NaN stats.
+    
+    Args:
+        rows: Raw result rows, in display order
+    
+    Returns:
+        DataFrame with one row per experiment
+    """
+    n = len(rows)
+    lengths = np.array([
+        len(r['pointwise_effects']) if r['pointwise_effects'] is not None else 0
+        for r in rows
+    ])
+    effects = np.full((n, max(lengths.max(initial=0), 1)), np.nan)
+    for i, r in enumerate(rows):
+        if lengths[i]:
+            effects[i, :lengths[i]] = r['pointwise_effects']
+    ok = lengths > 0
+    post_sum = np.array([r['post_sum'] for r in rows], dtype=np.float64)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        point_est = np.where(ok, np.nansum(effects, axis=1), np.nan)
+        avg_daily = np.full(n, np.nan)
+        effect_se = np.full(n, np.nan)
+        if ok.any():
+            avg_daily[ok] = np.nanmean(effects[ok], axis=1)
+            effect_se[ok] = np.nanstd(effects[ok], axis=1) / np.sqrt(lengths[ok])
+        pct_effect = np.where(post_sum != 0, point_est / post_sum * 100, 0.0)
+        pct_effect[~ok] = np.nan
+        
+        # Statistical test
+        z_score = np.where(effect_se > 0, point_est / effect_se, 0.0)
+        z_score[~ok] = np.nan
+        # Two-sided p-value from the normal survival function (NaN stays NaN)
+        p_value = 2 * norm.sf(np.abs(z_score))
+    
+    return pd.DataFrame({
+        'experiment_id': [r['experiment_id'] for r in rows],
+        'test_market': [r['test_market'] for r in rows],
+        'control_market': [r['control_market'] for r in rows],
+        'planned_effect': [r['planned_effect'] for r in rows],
+        'estimated_effect': point_est,
+        'effect_pct': pct_effect,
+        'avg_daily': avg_daily,
+        'p_value': p_value,
+        'z_score': z_score,
+        'days': [r['days'] for r in rows],
+        'pre_corr': [r['pre_corr'] for r in rows],
+        'confounders': [r['confounders'] for r in rows]
+    })
@@ -0,0 +1,36 @@
+"""
+Helpers for preparing series before they are handed to Plotly.
+"""
+
+import numpy as np
+from typing import Optional, Sequence
+
+
+def downsample_indices(series: Sequence[np.ndarray], target: int = 500) -> Optional[np.ndarray]:
+    """
+    Row indices to plot when a chart has more than `target` points.
+    
+    Splits the rows into buckets and keeps the min and max of every
+    series in each bucket, so spikes and drops survive.
+    
+    Args:
+        series: Equal-length series that share the x axis
+        target: Approximate maximum number of points to keep
+    
+    Returns:
+        Sorted row indices to keep, or None if no downsampling is needed
+    """
+    n = len(series[0])
+    if n <= target:
+        return None
+
+    bucket = int(np.ceil(n / max(target // (2 * len(series)), 1)))
+    n_buckets = int(np.ceil(n / bucket))
+    offsets = np.arange(n_buckets) * bucket
+    keep = [np.array([0, n - 1])]
+    for values in series:
+        padded = np.pad(np.asarray(values), (0, n_buckets * bucket - n), mode='edge')
+        blocks = padded.reshape(n_buckets, bucket)
+        keep.append(offsets + blocks.argmin(axis=1))
+        keep.append(offsets + blocks.argmax(axis=1))
+    return np.unique(np.minimum(np.concatenate(keep), n - 1))
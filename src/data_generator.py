@@ -4,6 +4,10 @@ from typing import Tuple, Dict, List
 from datetime import datetime, timedelta
 
 
+# sin(2*pi*k/7) for each day of the week, so seasonality is a lookup
+WEEKLY_SINE = np.sin(2 * np.pi * np.arange(7) / 7)
+
+
 class StochasticSEOGenerator:
     """
     Generates realistic stochastic time-series data for SEO experiments.
@@ -21,8 +25,8 @@ class StochasticSEOGenerator:
         Args:
             seed: Optional random seed for reproducibility
         """
-        if seed is not None:
-            np.random.seed(seed)
+        # Per-instance PCG64 generator (independent of NumPy's global state)
+        self.rng = np.random.default_rng(seed)
         
         # Parameter ranges (internal only - hidden from user)
         self.baseline_mean_range = (500, 5000)
@@ -52,42 +56,44 @@ class StochasticSEOGenerator:
         Returns:
             Array of baseline values
         """
-        # Sample parameters if not provided
-        if baseline_mean is None:
-            baseline_mean = np.random.uniform(*self.baseline_mean_range)
-        if trend_drift is None:
-            trend_drift = np.random.uniform(*self.trend_drift_range)
-        if seasonality_amplitude is None:
-            seasonality_amplitude = np.random.uniform(*self.seasonality_amplitude_range)
-        if noise_std is None:
-            noise_std = np.random.uniform(*self.noise_std_range)
-        
-        # Build components
+        # Sample the parameters that were not provided, in one draw (this
+        # consumes the stream exactly like one scalar draw per parameter)
+        params = [baseline_mean, trend_drift, seasonality_amplitude, noise_std]
+        missing = [i for i, value in enumerate(params) if value is None]
+        if missing:
+            ranges = np.array([
+                self.baseline_mean_range,
+                self.trend_drift_range,
+                self.seasonality_amplitude_range,
+                self.noise_std_range
+            ])[missing]
+            for i, value in zip(missing, self.rng.uniform(ranges[:, 0], ranges[:, 1])):
+                params[i] = value
+        baseline_mean, trend_drift, seasonality_amplitude, noise_std = params
+        
+        # Components are accumulated into one buffer
         days = np.arange(n_days)
         
-        # Trend: Brownian motion with drift
-        trend = baseline_mean + trend_drift * days * baseline_mean
-        
         # Seasonality: Weekly sine wave
         # Day 0 = Monday, Day 4 = Friday, Day 5-6 = Weekend valley
-        day_of_week = days % 7
-        seasonality = seasonality_amplitude * baseline_mean * np.sin(2 * np.pi * day_of_week / 7)
+        baseline = WEEKLY_SINE[days % 7] * (seasonality_amplitude * baseline_mean)
         
-        # Noise: Gaussian
-        noise = np.random.normal(0, noise_std * baseline_mean, n_days)
+        # Trend: Brownian motion with drift
+        baseline += baseline_mean + trend_drift * days * baseline_mean
         
-        # Combine
-        baseline = trend + seasonality + noise
+        # Noise: Gaussian
+        baseline += self.rng.standard_normal(n_days) * (noise_std * baseline_mean)
         
         # Ensure non-negative
-        baseline = np.maximum(baseline, 100)
+        np.maximum(baseline, 100, out=baseline)
         
         return baseline
     
     def generate_control_market(
         self,
         baseline: np.ndarray,
-        correlation: float = None
+        correlation: float = None,
+        baseline_std: float = None
     ) -> np.ndarray:
         """
         Generate control market as baseline + correlated noise.
@@ -95,18 +101,21 @@ class StochasticSEOGenerator:
         Args:
             baseline: Latent baseline series
             correlation: Desired correlation with baseline (if None, sampled)
+            baseline_std: Precomputed baseline.std() (if None, computed)
         
         Returns:
             Control market series
         """
         if correlation is None:
-            correlation = np.random.uniform(*self.control_correlation_range)
+            correlation = self.rng.uniform(*self.control_correlation_range)
         
         n_days = len(baseline)
+        if baseline_std is None:
+            baseline_std = baseline.std()
         
         # Correlated noise: ε_control ~ N(0, σ)
         # Correlation achieved by mixing with baseline
-        noise = np.random.normal(0, baseline.std() * 0.5, n_days)
+        noise = self.rng.standard_normal(n_days) * (baseline_std * 0.5)
         
         # Mix: control = correlation * baseline + (1 - correlation) * independent_noise
         control = correlation * baseline + (1 - correlation) * noise
@@ -116,11 +125,69 @@ class StochasticSEOGenerator:
         
         return control, correlation
     
+    def generate_baselines_batch(
+        self,
+        n_markets: int,
+        n_days: int = 90
+    ) -> np.ndarray:
+        """
+        Generate independent baseline series for many markets at once.
+        
+        Vectorized equivalent of calling generate_baseline() n_markets times
+        with sampled parameters.
+        
+        Args:
+            n_markets: Number of markets (rows) to generate
+            n_days: Number of days to generate
+        
+        Returns:
+            Array of shape (n_markets, n_days)
+        """
+        # Sample per-market parameters as column vectors for broadcasting
+        shape = (n_markets, 1)
+        baseline_mean = self.rng.uniform(*self.baseline_mean_range, size=shape)
+        trend_drift = self.rng.uniform(*self.trend_drift_range, size=shape)
+        seasonality_amplitude = self.rng.uniform(*self.seasonality_amplitude_range, size=shape)
+        noise_std = self.rng.uniform(*self.noise_std_range, size=shape)
+        
+        days = np.arange(n_days)
+        baselines = WEEKLY_SINE[days % 7] * (seasonality_amplitude * baseline_mean)
+        baselines += baseline_mean + trend_drift * days * baseline_mean
+        baselines += self.rng.normal(0, noise_std * baseline_mean, (n_markets, n_days))
+        
+        return np.maximum(baselines, 100, out=baselines)
+    
+    def generate_control_markets_batch(
+        self,
+        baselines: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate one control series per row of a baseline matrix.
+        
+        Vectorized equivalent of generate_control_market() applied row-wise.
+        
+        Args:
+            baselines: Array of shape (n_markets, n_days)
+        
+        Returns:
+            Tuple of (control series of shape (n_markets, n_days), correlations)
+        """
+        n_markets = baselines.shape[0]
+        correlation = self.rng.uniform(*self.control_correlation_range, size=(n_markets, 1))
+        noise = self.rng.normal(0, baselines.std(axis=1, keepdims=True) * 0.5, baselines.shape)
+        
+        control = correlation * baselines + (1 - correlation) * noise
+        control = np.maximum(control, 100)
+        
+        return control, correlation.ravel()
+    
     def generate_treatment_market(
         self,
         baseline: np.ndarray,
         effect_params: Dict,
-        correlation: float = None
+        correlation: float = None,
+        baseline_std: float = None,
+        post_mean: float = None
     ) -> Tuple[np.ndarray, Dict]:
         """
         Generate treatment market with injected causal effect.
@@ -129,47 +196,59 @@ class StochasticSEOGenerator:
             baseline: Latent baseline series
             effect_params: Dict with keys:
                 - 'intervention_day': Day to start treatment (default 90)
-                - 'mde_pct': Effect size as % (e.g., 0.08 for +8%)
+                - 'mde_pct': Effect size as % (e.g., 0.08 for +8%), or a
+                  1-D array of effect sizes to generate them all from the
+                  same random draws
                 - 'effect_shape': 'step', 'ramp', or 'delayed_step'
             correlation: Control correlation (if None, sampled)
+            baseline_std: Precomputed baseline.std() (if None, computed)
+            post_mean: Precomputed mean of the baseline from the
+                intervention day on (if None, computed)
         
         Returns:
-            Tuple of (treatment series, applied effects)
+            Tuple of (treatment series, applied effects); the series has
+            shape (n_days,) for a scalar mde_pct, else (n_effects, n_days)
         """
         if correlation is None:
-            correlation = np.random.uniform(*self.control_correlation_range)
+            correlation = self.rng.uniform(*self.control_correlation_range)
         
         n_days = len(baseline)
         intervention_day = effect_params.get('intervention_day', 90)
         mde_pct = effect_params.get('mde_pct', 0.08)
         effect_shape = effect_params.get('effect_shape', 'step')
+        if baseline_std is None:
+            baseline_std = baseline.std()
+        if post_mean is None:
+            post_mean = baseline[intervention_day:].mean()
         
         # Add randomness to MDE: ±20%
-        mde_actual = mde_pct * np.random.uniform(0.80, 1.20)
+        mde_actual = np.multiply(mde_pct, self.rng.uniform(0.80, 1.20))
+        # Column of effect sizes; broadcasts against the day axis
+        mde_col = np.expand_dims(mde_actual, -1)
         
         # Generate correlated noise
-        noise = np.random.normal(0, baseline.std() * 0.5, n_days)
+        noise = self.rng.standard_normal(n_days) * (baseline_std * 0.5)
         treatment = correlation * baseline + (1 - correlation) * noise
         
         # Build effect injection
-        effect_array = np.zeros(n_days)
+        effect_array = np.zeros(np.shape(mde_actual) + (n_days,))
         
         if effect_shape == 'step':
             # Immediate effect
-            effect_array[intervention_day:] = mde_actual * baseline[intervention_day:].mean()
+            effect_array[..., intervention_day:] = mde_col * post_mean
         
         elif effect_shape == 'ramp':
             # Ramp up over 14 days
             ramp_length = 14
-            for i in range(intervention_day, min(intervention_day + ramp_length, n_days)):
-                ramp_progress = (i - intervention_day) / ramp_length
-                effect_array[i] = mde_actual * ramp_progress * baseline[i].mean()
-            effect_array[intervention_day + ramp_length:] = mde_actual * baseline[intervention_day:].mean()
+            ramp_days = np.arange(intervention_day, min(intervention_day + ramp_length, n_days))
+            ramp_progress = (ramp_days - intervention_day) / ramp_length
+            effect_array[..., ramp_days] = mde_col * ramp_progress * baseline[ramp_days]
+            effect_array[..., intervention_day + ramp_length:] = mde_col * post_mean
         
         elif effect_shape == 'delayed_step':
             # Delay 7 days, then step
             delay = 7
-            effect_array[intervention_day + delay:] = mde_actual * baseline[intervention_day:].mean()
+            effect_array[..., intervention_day + delay:] = mde_col * post_mean
         
         treatment = treatment + effect_array
         treatment = np.maximum(treatment, 100)
@@ -194,7 +273,8 @@ class StochasticSEOGenerator:
         Apply confounding events to series.
         
         Args:
-            series: Time series to modify
+            series: Time series to modify, shape (n_days,) or
+                (n_series, n_days); every row gets the same event
             confounder_type: 'algorithm_update', 'seasonality_spike', 'tracking_break'
             intervention_day: Day to start intervention
         
@@ -202,75 +282,83 @@ class StochasticSEOGenerator:
             Tuple of (modified series, confounder info)
         """
         series = series.copy()
+        n_days = series.shape[-1]
         confounder_info = {'type': confounder_type}
         
         if confounder_type == 'algorithm_update':
             # Drop 15-25% for 7 days, starting at random day after intervention
-            start_day = np.random.randint(intervention_day, len(series) - 7)
-            magnitude = np.random.uniform(0.15, 0.25)
-            series[start_day:start_day + 7] *= (1 - magnitude)
+            start_day = self.rng.integers(intervention_day, n_days - 7)
+            magnitude = self.rng.uniform(0.15, 0.25)
+            series[..., start_day:start_day + 7] *= (1 - magnitude)
             confounder_info['start_day'] = start_day
             confounder_info['magnitude'] = magnitude
         
         elif confounder_type == 'seasonality_spike':
             # +20% for 5 days (simulates holiday/promo)
-            start_day = np.random.randint(intervention_day, len(series) - 5)
+            start_day = self.rng.integers(intervention_day, n_days - 5)
             magnitude = 0.20
-            series[start_day:start_day + 5] *= (1 + magnitude)
+            series[..., start_day:start_day + 5] *= (1 + magnitude)
             confounder_info['start_day'] = start_day
             confounder_info['magnitude'] = magnitude
         
         elif confounder_type == 'tracking_break':
             # Remove 30% of data points randomly for 3 days
-            start_day = np.random.randint(intervention_day, len(series) - 3)
+            start_day = self.rng.integers(intervention_day, n_days - 3)
             loss_fraction = 0.30
-            for i in range(start_day, start_day + 3):
-                if np.random.random() < loss_fraction:
-                    series[i] = np.nan
+            lost = self.rng.random(3) < loss_fraction
+            series[..., start_day:start_day + 3][..., lost] = np.nan
             confounder_info['start_day'] = start_day
             confounder_info['loss_fraction'] = loss_fraction
         
         return series, confounder_info
     
-    def generate_experiment_data(
+    def generate_experiment_series(
         self,
-        test_market: str,
-        control_market: str,
         pre_period_days: int = 90,
         post_period_days: int = 42,
-        mde_pct: float = 0.08,
+        mde_pct=0.08,
         effect_shape: str = 'step',
         confounders: List[str] = None
     ) -> Dict:
         """
-        Generate complete experiment dataset.
+        Generate the raw test/control arrays for one market pair.
+        
+        Passing an array of effect sizes generates the test market under each
+        of them from the same random draws in one pass: row i is exactly what
+        a scalar call with mde_pct[i] and the same seed would return.
         
         Args:
-            test_market: Name of test market
-            control_market: Name of control market
             pre_period_days: Days of pre-intervention data
             post_period_days: Days of post-intervention data
-            mde_pct: Effect size as percentage
+            mde_pct: Effect size as percentage, or a 1-D array of them
             effect_shape: 'step', 'ramp', or 'delayed_step'
             confounders: List of confounders to apply
         
         Returns:
-            Dict with dataframes and metadata
+            Dict with 'test_market' (shape (n_days,) or (n_effects, n_days)),
+            'control_market', 'control_correlation', 'effect_info' and
+            'confounders' (applied confounder log)
         """
         total_days = pre_period_days + post_period_days
         
         # Generate latent baseline
         baseline = self.generate_baseline(n_days=total_days)
         
+        # Reductions shared by both markets
+        baseline_std = baseline.std()
+        post_mean = baseline[pre_period_days:].mean()
+        
         # Generate markets
-        control, control_corr = self.generate_control_market(baseline)
+        control, control_corr = self.generate_control_market(baseline, baseline_std=baseline_std)
         treatment, effect_info = self.generate_treatment_market(
             baseline,
             {
                 'intervention_day': pre_period_days,
                 'mde_pct': mde_pct,
                 'effect_shape': effect_shape
-            }
+            },
+            baseline_std=baseline_std,
+            post_mean=post_mean
         )
         
         # Apply confounders if specified
@@ -284,13 +372,55 @@ class StochasticSEOGenerator:
                 )
                 confounder_log.append(conf_info)
         
+        return {
+            'test_market': treatment,
+            'control_market': control,
+            'control_correlation': control_corr,
+            'effect_info': effect_info,
+            'confounders': confounder_log
+        }
+    
+    def generate_experiment_data(
+        self,
+        test_market: str,
+        control_market: str,
+        pre_period_days: int = 90,
+        post_period_days: int = 42,
+        mde_pct: float = 0.08,
+        effect_shape: str = 'step',
+        confounders: List[str] = None
+    ) -> Dict:
+        """
+        Generate complete experiment dataset.
+        
+        Args:
+            test_market: Name of test market
+            control_market: Name of control market
+            pre_period_days: Days of pre-intervention data
+            post_period_days: Days of post-intervention data
+            mde_pct: Effect size as percentage
+            effect_shape: 'step', 'ramp', or 'delayed_step'
+            confounders: List of confounders to apply
+        
+        Returns:
+            Dict with dataframes and metadata
+        """
+        total_days = pre_period_days + post_period_days
+        series = self.generate_experiment_series(
+            pre_period_days=pre_period_days,
+            post_period_days=post_period_days,
+            mde_pct=mde_pct,
+            effect_shape=effect_shape,
+            confounders=confounders
+        )
+        
         # Build dataframe
         dates = pd.date_range(start='2024-10-01', periods=total_days, freq='D')
         
         data = pd.DataFrame({
             'date': dates,
-            'test_market': treatment,
-            'control_market': control,
+            'test_market': series['test_market'],
+            'control_market': series['control_market'],
             'period': ['pre'] * pre_period_days + ['post'] * post_period_days,
             'day_num': range(1, total_days + 1)
         })
@@ -300,9 +430,9 @@ class StochasticSEOGenerator:
             'control_market_name': control_market,
             'pre_period_days': pre_period_days,
             'post_period_days': post_period_days,
-            'effect_info': effect_info,
-            'control_correlation': control_corr,
-            'confounders': confounder_log
+            'effect_info': series['effect_info'],
+            'control_correlation': series['control_correlation'],
+            'confounders': series['confounders']
         }
         
         return {'data': data, 'metadata': metadata}
@@ -4,11 +4,42 @@ import os
 from datetime import datetime
 
 
+# experiments columns after run_id, in INSERT order, with the value used when
+# a run's metadata leaves one out
+EXPERIMENT_DEFAULTS = {
+    'template_name': 'Unknown',
+    'test_market': 'Unknown',
+    'control_market': 'Unknown',
+    'intervention_day': 90,
+    'pre_period_days': 90,
+    'post_period_days': 42,
+    'mde_requested': 0.08,
+    'mde_applied': 0.08,
+    'effect_shape': 'step',
+    'status': 'completed'
+}
+
+
 class DuckDBManager:
     """
     Manages DuckDB connection and schema for SEO experiment storage.
     """
     
+    # Parameterized so values are bound, never spliced into the SQL text
+    INSERT_EXPERIMENT_SQL = """
+        INSERT INTO experiments 
+        (run_id, template_name, test_market, control_market, 
+         intervention_day, pre_period_days, post_period_days,
+         mde_requested, mde_applied, effect_shape, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    INSERT_CAUSAL_RESULTS_SQL = """
+        INSERT INTO causal_results
+        (run_id, point_estimate, ci_lower, ci_upper, cumulative_effect,
+         probability_causal_effect, pre_trend_similarity, placebo_score, sensitivity_score)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
     def __init__(self, db_path: str = 'data/simulation.duckdb'):
         """
         Initialize DuckDB manager.
@@ -54,6 +85,11 @@ class DuckDBManager:
             )
         """)
         
+        # Point lookups by run (query_experiment_data) and recency ordering
+        # (query_experiment_history)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_metrics_run ON experiment_metrics(run_id)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_experiments_created ON experiments(created_at)")
+        
         # CausalImpact results
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS causal_results (
@@ -108,43 +144,99 @@ class DuckDBManager:
             metrics_df: DataFrame with daily metrics
         """
         # Insert into experiments
-        self.conn.execute(f"""
-            INSERT INTO experiments 
-            (run_id, template_name, test_market, control_market, 
-             intervention_day, pre_period_days, post_period_days,
-             mde_requested, mde_applied, effect_shape)
-            VALUES 
-            ('{run_id}', '{experiment_data['template_name']}', 
-             '{experiment_data['test_market']}', '{experiment_data['control_market']}',
-             {experiment_data['intervention_day']}, {experiment_data['pre_period_days']},
-             {experiment_data['post_period_days']}, {experiment_data['mde_requested']},
-             {experiment_data['mde_applied']}, '{experiment_data['effect_shape']}')
-        """)
+        self.conn.execute(self.INSERT_EXPERIMENT_SQL, [
+            run_id,
+            experiment_data['template_name'],
+            experiment_data['test_market'],
+            experiment_data['control_market'],
+            experiment_data['intervention_day'],
+            experiment_data['pre_period_days'],
+            experiment_data['post_period_days'],
+            experiment_data['mde_requested'],
+            experiment_data['mde_applied'],
+            experiment_data['effect_shape'],
+            'completed'
+        ])
         
-        # Insert metrics
-        metrics_df['run_id'] = run_id
+        # Insert metrics (run_id is bound per statement, not added as a column)
         self.conn.register('metrics_temp', metrics_df)
         self.conn.execute("""
             INSERT INTO experiment_metrics 
-            SELECT run_id, date, test_value, control_value, period, day_num FROM metrics_temp
-        """)
+            SELECT ?, date, test_value, control_value, period, day_num FROM metrics_temp
+        """, [run_id])
+        self.conn.unregister('metrics_temp')
     
     def save_causal_results(self, run_id: str, results: dict):
         """Save CausalImpact results."""
-        self.conn.execute(f"""
-            INSERT INTO causal_results
-            (run_id, point_estimate, ci_lower, ci_upper, cumulative_effect,
-             probability_causal_effect, pre_trend_similarity, placebo_score, sensitivity_score)
-            VALUES
-            ({results['point_estimate']}, {results['ci_lower']}, {results['ci_upper']},
-             {results['cumulative_effect']}, {results['probability_causal_effect']},
-             {results['pre_trend_similarity']}, {results['placebo_score']},
-             {results['sensitivity_score']})
-        """)
+        self.conn.execute(self.INSERT_CAUSAL_RESULTS_SQL, [
+            run_id,
+            results['point_estimate'],
+            results['ci_lower'],
+            results['ci_upper'],
+            results['cumulative_effect'],
+            results['probability_causal_effect'],
+            results['pre_trend_similarity'],
+            results['placebo_score'],
+            results['sensitivity_score']
+        ])
+    
+    @staticmethod
+    def experiment_row(run_id: str, metadata: dict) -> tuple:
+        """
+        Build an experiments row from run metadata, filling EXPERIMENT_DEFAULTS
+        for missing keys.
+        
+        Args:
+            run_id: Unique experiment ID
+            metadata: Dict with experiment parameters
+        
+        Returns:
+            Tuple in INSERT_EXPERIMENT_SQL column order (usable with
+            save_experiments_bulk)
+        """
+        return (run_id,) + tuple(
+            metadata.get(column, default) for column, default in EXPERIMENT_DEFAULTS.items()
+        )
+    
+    def save_experiments_bulk(self, rows: list):
+        """
+        Save many experiment rows in a single transaction.
+        
+        Args:
+            rows: Tuples in INSERT_EXPERIMENT_SQL column order (run_id,
+                template_name, test_market, control_market, intervention_day,
+                pre_period_days, post_period_days, mde_requested, mde_applied,
+                effect_shape, status)
+        """
+        self._executemany(self.INSERT_EXPERIMENT_SQL, rows)
+    
+    def save_causal_results_bulk(self, rows: list):
+        """
+        Save many CausalImpact result rows in a single transaction.
+        
+        Args:
+            rows: Tuples in INSERT_CAUSAL_RESULTS_SQL column order (run_id,
+                point_estimate, ci_lower, ci_upper, cumulative_effect,
+                probability_causal_effect, pre_trend_similarity,
+                placebo_score, sensitivity_score)
+        """
+        self._executemany(self.INSERT_CAUSAL_RESULTS_SQL, rows)
+    
+    def _executemany(self, sql: str, rows: list):
+        """Run one statement over many rows, committing once (all or nothing)."""
+        if not rows:
+            return
+        self.conn.begin()
+        try:
+            self.conn.executemany(sql, rows)
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
     
     def query_experiment_history(self, limit: int = 10) -> pd.DataFrame:
         """Get recent experiment history."""
-        return self.conn.execute(f"""
+        return self.conn.execute("""
             SELECT 
                 run_id,
                 template_name,
@@ -154,8 +246,8 @@ class DuckDBManager:
                 created_at
             FROM experiments
             ORDER BY created_at DESC
-            LIMIT {limit}
-        """).df()
+            LIMIT ?
+        """, [limit]).df()
     
     def save_simulation_run(self, run_id: str, metadata: dict, metrics_df: pd.DataFrame):
         """
@@ -167,35 +259,18 @@ class DuckDBManager:
             metrics_df: DataFrame with daily metrics
         """
         # Insert experiment metadata
-        self.conn.execute(f"""
-            INSERT INTO experiments 
-            (run_id, template_name, test_market, control_market, 
-             intervention_day, pre_period_days, post_period_days,
-             mde_requested, mde_applied, effect_shape, status)
-            VALUES 
-            ('{run_id}', 
-             '{metadata.get('template_name', 'Unknown')}', 
-             '{metadata.get('test_market', 'Unknown')}', 
-             '{metadata.get('control_market', 'Unknown')}',
-             {metadata.get('intervention_day', 90)}, 
-             {metadata.get('pre_period_days', 90)},
-             {metadata.get('post_period_days', 42)}, 
-             {metadata.get('mde_requested', 0.08)},
-             {metadata.get('mde_applied', 0.08)}, 
-             '{metadata.get('effect_shape', 'step')}',
-             'completed')
-        """)
+        self.conn.execute(self.INSERT_EXPERIMENT_SQL, self.experiment_row(run_id, metadata))
         
-        # Insert metrics
-        metrics_df_copy = metrics_df.copy()
-        metrics_df_copy['run_id'] = run_id
-        self.conn.register('metrics_temp', metrics_df_copy)
+        # Insert metrics; DuckDB scans the registered frame in place, so
+        # run_id is bound per statement rather than copied onto the frame
+        self.conn.register('metrics_temp', metrics_df)
         self.conn.execute("""
             INSERT INTO experiment_metrics 
-            SELECT run_id, date, test_market_metric as test_value, 
+            SELECT ?, date, test_market_metric as test_value, 
                    control_market_metric as control_value, period, day_num 
             FROM metrics_temp
-        """)
+        """, [run_id])
+        self.conn.unregister('metrics_temp')
     
     def query_experiment_data(self, run_id: str) -> pd.DataFrame:
         """
@@ -207,7 +282,7 @@ class DuckDBManager:
         Returns:
             DataFrame with experiment metrics
         """
-        return self.conn.execute(f"""
+        return self.conn.execute("""
             SELECT 
                 em.date,
                 em.test_value,
@@ -219,9 +294,9 @@ class DuckDBManager:
                 e.control_market
             FROM experiment_metrics em
             JOIN experiments e ON em.run_id = e.run_id
-            WHERE em.run_id = '{run_id}'
+            WHERE em.run_id = ?
             ORDER BY em.date
-        """).df()
+        """, [run_id]).df()
     
     def close(self):
         """Close database connection."""
@@ -1,14 +1,13 @@
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import Ridge
-from sklearn.preprocessing import StandardScaler
+from scipy.optimize import nnls
 from typing import Tuple, Dict, List
 
 
 class MarketMatcher:
     """
     Matches test markets to control candidates using Euclidean distance.
-    Builds synthetic controls via Ridge regression.
+    Builds synthetic controls via non-negative Ridge regression.
     """
     
     # Top 20 US DMAs (Designated Market Areas)
@@ -97,25 +96,76 @@ class MarketMatcher:
         Returns:
             DataFrame with columns: [Market, Euclidean_Distance, Correlation, Rank]
         """
-        results = []
-        
-        for control_name, control_series in control_markets_data.items():
-            distance = self.euclidean_distance(test_market_data, control_series)
-            corr = self.correlation(test_market_data, control_series)
-            
-            results.append({
-                'Market': control_name,
-                'Euclidean_Distance': distance,
-                'Correlation': corr,
-                'Normalized_Distance': distance / len(test_market_data)  # Scale by series length
-            })
-        
-        # Sort by Euclidean distance (lower is better)
-        df = pd.DataFrame(results)
-        df = df.sort_values('Euclidean_Distance').reset_index(drop=True)
-        df['Rank'] = range(1, len(df) + 1)
-        
-        return df[['Rank', 'Market', 'Euclidean_Distance', 'Correlation']].head(top_k)
+        control_names = list(control_markets_data.keys())
+        control_matrix = np.vstack([control_markets_data[name] for name in control_names])
+        
+        return self.rank_controls(test_market_data, control_matrix, control_names, top_k=top_k)
+    
+    def normalize_controls(self, control_matrix: np.ndarray) -> np.ndarray:
+        """
+        Center each control series and scale it to unit norm.
+        
+        Pearson correlation with any test series is then a single
+        matrix-vector product, so a fixed candidate set only needs this once.
+        
+        Args:
+            control_matrix: Control market series, shape (n_controls, n_days)
+        
+        Returns:
+            Array of the same shape with zero-mean, unit-norm rows
+        """
+        controls_centered = control_matrix - control_matrix.mean(axis=1, keepdims=True)
+        return controls_centered / np.linalg.norm(controls_centered, axis=1, keepdims=True)
+    
+    def rank_controls(
+        self,
+        test_market_data: np.ndarray,
+        control_matrix: np.ndarray,
+        control_names: List[str],
+        top_k: int = 5,
+        controls_normalized: np.ndarray = None
+    ) -> pd.DataFrame:
+        """
+        Rank stacked control candidates by Euclidean distance to the test market.
+        
+        Distances and correlations for all candidates are computed in one
+        vectorized pass over the (n_controls, n_days) matrix.
+        
+        Args:
+            test_market_data: Time series for test market, shape (n_days,)
+            control_matrix: Control market series, shape (n_controls, n_days)
+            control_names: Names matching the rows of control_matrix
+            top_k: Number of top candidates to return
+            controls_normalized: normalize_controls(control_matrix), if already
+                computed (if None, computed)
+        
+        Returns:
+            DataFrame with columns: [Rank, Market, Euclidean_Distance, Correlation]
+        """
+        # Euclidean distance per row: sqrt(sum((C_i - T)^2))
+        diffs = control_matrix - test_market_data
+        distances = np.sqrt(np.einsum('ij,ij->i', diffs, diffs))
+        
+        # Pearson correlation per row: dot product of unit-norm centered series
+        if controls_normalized is None:
+            controls_normalized = self.normalize_controls(control_matrix)
+        test_centered = test_market_data - test_market_data.mean()
+        correlations = controls_normalized @ (test_centered / np.linalg.norm(test_centered))
+        
+        # Sort by Euclidean distance (lower is better); only the top_k
+        # candidates are sorted, after an O(n) partition
+        if 0 < top_k < len(distances):
+            candidates = np.argpartition(distances, top_k - 1)[:top_k]
+            order = candidates[np.argsort(distances[candidates], kind='stable')]
+        else:
+            order = np.argsort(distances, kind='stable')[:top_k]
+        
+        return pd.DataFrame({
+            'Rank': np.arange(1, len(order) + 1),
+            'Market': [control_names[i] for i in order],
+            'Euclidean_Distance': distances[order],
+            'Correlation': correlations[order]
+        })
     
     def build_synthetic_control(
         self,
@@ -149,27 +199,45 @@ class MarketMatcher:
         Returns:
             Tuple of (synthetic_control_series, weights_dict)
         """
-        from sklearn.linear_model import Ridge
-        
         # Use all candidates if not specified
         if selected_controls is None:
             selected_controls = list(control_candidates.keys())
         
-        # Stack control data as columns
-        control_data = np.column_stack([
-            control_candidates[name]
-            for name in selected_controls
-        ])
+        control_matrix = np.vstack([control_candidates[name] for name in selected_controls])
+        
+        return self.fit_synthetic_control(test_market_data, control_matrix, selected_controls, alpha=alpha)
+    
+    def fit_synthetic_control(
+        self,
+        test_market_data: np.ndarray,
+        control_matrix: np.ndarray,
+        control_names: List[str],
+        alpha: float = 1.0
+    ) -> Tuple[np.ndarray, Dict]:
+        """
+        Build synthetic control from stacked control series.
+        (Matrix form of build_synthetic_control)
+        
+        Args:
+            test_market_data: Time series for test market (Y), shape (n_days,)
+            control_matrix: Control market series, shape (n_controls, n_days)
+            control_names: Names matching the rows of control_matrix
+            alpha: Ridge regularization parameter (higher = more regularization)
         
-        # Fit Ridge regression with positive-only weights (non-negative constraint)
-        # Using positive_only parameter to enforce w >= 0
-        model = Ridge(alpha=alpha, fit_intercept=False)
-        model.fit(control_data, test_market_data)
+        Returns:
+            Tuple of (synthetic_control_series, weights_dict)
+        """
+        selected_controls = list(control_names)
+        
+        # Controls as columns (X); a transposed view, no copy
+        control_data = control_matrix.T
         
-        # Get coefficients and enforce non-negative constraint
-        raw_weights = model.coef_
-        # Clip negative weights to 0 (for realistic interpretation)
-        constrained_weights = np.maximum(raw_weights, 0)
+        # Non-negative Ridge (no intercept): min ||y - Xw||^2 + alpha * ||w||^2, w >= 0,
+        # solved exactly as NNLS on the augmented system [X; sqrt(alpha) I] w = [y; 0]
+        n_controls = control_data.shape[1]
+        augmented_X = np.vstack([control_data, np.sqrt(alpha) * np.eye(n_controls)])
+        augmented_y = np.concatenate([test_market_data, np.zeros(n_controls)])
+        constrained_weights, _ = nnls(augmented_X, augmented_y)
         
         # Normalize weights to sum to 1.0 (each market's fractional contribution)
         weight_sum = np.sum(constrained_weights)
@@ -182,10 +250,8 @@ class MarketMatcher:
         # Generate synthetic control using normalized weights
         synthetic_control = control_data @ normalized_weights_array
         
-        # Calculate fit quality (RMSE)
-        residuals = test_market_data - synthetic_control
-        rmse = np.sqrt(np.mean(residuals ** 2))
-        r_squared = 1 - (np.sum(residuals ** 2) / np.sum((test_market_data - test_market_data.mean()) ** 2))
+        # Calculate fit quality (RMSE, R², ...)
+        fit = self._fit_metrics(test_market_data, synthetic_control)
         
         # Build weights dictionary
         weights = {}
@@ -196,8 +262,10 @@ class MarketMatcher:
             'selected_controls': selected_controls,
             'weights': weights,
             'normalized_weights': weights,  # Already normalized
-            'rmse': rmse,
-            'r_squared': r_squared,
+            'rmse': fit['rmse'],
+            'mae': fit['mae'],
+            'r_squared': fit['r_squared'],
+            'correlation': fit['correlation'],
             'alpha': alpha,
             'weight_sum': float(np.sum(normalized_weights_array))
         }
@@ -219,17 +287,49 @@ class MarketMatcher:
         Returns:
             Dict with metrics
         """
-        residuals = test_market_data - synthetic_control_data
-        rmse = np.sqrt(np.mean(residuals ** 2))
-        mae = np.mean(np.abs(residuals))
-        correlation = np.corrcoef(test_market_data, synthetic_control_data)[0, 1]
+        fit = self._fit_metrics(test_market_data, synthetic_control_data)
+        
+        return {
+            'rmse': fit['rmse'],
+            'mae': fit['mae'],
+            'correlation': fit['correlation'],
+            'rmse_pct': fit['rmse_pct']
+        }
+    
+    def _fit_metrics(
+        self,
+        actual: np.ndarray,
+        predicted: np.ndarray
+    ) -> Dict:
+        """
+        Fit-quality metrics shared by fit_synthetic_control and
+        evaluate_pre_period_fit, from one residual array and a few dot products.
+        
+        Args:
+            actual: Observed series
+            predicted: Fitted / synthetic series
+        
+        Returns:
+            Dict with rmse, mae, r_squared, correlation and rmse_pct
+        """
+        n = len(actual)
+        actual_mean = actual.mean()
+        residuals = actual - predicted
+        sse = residuals @ residuals
+        
+        actual_centered = actual - actual_mean
+        predicted_centered = predicted - predicted.mean()
+        sst = actual_centered @ actual_centered
         
-        # Calculate RMSE as % of test market mean
-        rmse_pct = (rmse / test_market_data.mean()) * 100
+        rmse = np.sqrt(sse / n)
         
         return {
             'rmse': rmse,
-            'mae': mae,
-            'correlation': correlation,
-            'rmse_pct': rmse_pct
+            'mae': np.abs(residuals).mean(),
+            'r_squared': 1 - sse / sst,
+            'correlation': (actual_centered @ predicted_centered) / np.sqrt(
+                sst * (predicted_centered @ predicted_centered)
+            ),
+            # RMSE as % of test market mean
+            'rmse_pct': (rmse / actual_mean) * 100
         }
@@ -1,8 +1,32 @@
+import math
 import numpy as np
+from bisect import bisect_right
+from functools import lru_cache
 from scipy import stats
+from scipy.special import ndtri
 from typing import Dict, Tuple
 
 
+@lru_cache(maxsize=128)
+def _norm_ppf(p: float) -> float:
+    """
+    Standard normal quantile, memoized (alpha/power take few distinct values).
+    
+    Calls the ndtri ufunc directly rather than going through stats.norm.ppf,
+    which dispatches to the same routine.
+    """
+    return float(ndtri(p))
+
+
+# Power status bands: below 0.70 is low, below 0.80 medium, otherwise high
+POWER_STATUS_THRESHOLDS = (0.70, 0.80)
+POWER_STATUSES = (
+    ('low', '✗ Low power ({:.1%}) - Increase duration'),
+    ('medium', '⚠ Medium power ({:.1%}) - Consider extending'),
+    ('high', '✓ High power ({:.1%})'),
+)
+
+
 class PowerCalculator:
     """
     Calculates required sample size (duration) for SEO experiments.
@@ -45,23 +69,13 @@ class PowerCalculator:
             Dict with sample size and related metrics
         """
         # Critical values from standard normal distribution
-        z_alpha = stats.norm.ppf(1 - alpha / 2)  # Two-tailed
-        z_beta = stats.norm.ppf(power)
+        z_alpha = _norm_ppf(1 - alpha / 2)  # Two-tailed
+        z_beta = _norm_ppf(power)
         
         # Absolute effect size
         delta = baseline_mean * mde_pct
         
-        # Sample size formula
-        n = 2 * ((z_alpha + z_beta) ** 2) * (baseline_std ** 2) / (delta ** 2)
-        
-        # Round up to nearest day
-        n = int(np.ceil(n))
-        
-        # Ensure minimum of 7 days (1 week)
-        n = max(n, 7)
-        
-        # Ensure maximum of 90 days (about 3 months)
-        n = min(n, 90)
+        n = int(self.calculate_required_days(baseline_mean, baseline_std, mde_pct, alpha=alpha, power=power))
         
         result = {
             'required_days': n,
@@ -77,6 +91,41 @@ class PowerCalculator:
         
         return result
     
+    def calculate_required_days(
+        self,
+        baseline_mean,
+        baseline_std,
+        mde_pct,
+        alpha: float = 0.05,
+        power: float = 0.80
+    ) -> np.ndarray:
+        """
+        Calculate required duration for many designs in one vectorized pass.
+        (Array form of calculate_required_duration)
+        
+        Args:
+            baseline_mean: Average metric value(s) in pre-period
+            baseline_std: Standard deviation(s) in pre-period
+            mde_pct: Minimum detectable effect(s) as percentage
+            alpha: Significance level
+            power: Statistical power
+        
+        Returns:
+            Integer array of required days (broadcast shape of the inputs),
+            rounded up and clamped to 7-90 days
+        """
+        z_alpha = _norm_ppf(1 - alpha / 2)
+        z_beta = _norm_ppf(power)
+        
+        # Absolute effect size
+        delta = np.multiply(baseline_mean, mde_pct)
+        
+        # Sample size formula
+        n = 2 * ((z_alpha + z_beta) ** 2) * np.square(baseline_std) / (delta ** 2)
+        
+        # Round up to nearest day; at least 1 week, at most about 3 months
+        return np.clip(np.ceil(n), 7, 90).astype(np.int64)
+    
     def calculate_achieved_power(
         self,
         baseline_mean: float,
@@ -100,19 +149,21 @@ class PowerCalculator:
             Dict with achieved power and related metrics
         """
         # Critical value
-        z_alpha = stats.norm.ppf(1 - alpha / 2)
+        z_alpha = _norm_ppf(1 - alpha / 2)
         
         # Absolute effect size
         delta = baseline_mean * mde_pct
         
         # Non-centrality parameter
-        ncp = (delta / baseline_std) * np.sqrt(duration_days / 2)
+        ncp = float((delta / baseline_std) * math.sqrt(duration_days / 2))
         
         # Achieved power (probability of rejecting H0)
-        achieved_power = 1 - stats.nct.cdf(z_alpha, df=2*duration_days - 2, nc=ncp)
+        achieved_power = 1 - float(stats.nct.cdf(z_alpha, df=2*duration_days - 2, nc=ncp))
         
-        # Ensure power is between 0 and 1
-        achieved_power = np.clip(achieved_power, 0, 1)
+        # Ensure power is between 0 and 1 (plain floats, no ufunc dispatch);
+        # NaN from degenerate inputs is passed through, as np.clip did
+        if not math.isnan(achieved_power):
+            achieved_power = min(1.0, max(0.0, achieved_power))
         
         result = {
             'achieved_power': achieved_power,
@@ -126,6 +177,38 @@ class PowerCalculator:
         
         return result
     
+    def calculate_achieved_power_curve(
+        self,
+        baseline_mean: float,
+        baseline_std: float,
+        mde_pct: float,
+        durations: np.ndarray,
+        alpha: float = 0.05
+    ) -> np.ndarray:
+        """
+        Calculate achieved power for many durations in one vectorized pass.
+        (Array form of calculate_achieved_power)
+        
+        Args:
+            baseline_mean: Average metric value
+            baseline_std: Standard deviation
+            mde_pct: Minimum detectable effect as percentage
+            durations: Array of experiment durations (days)
+            alpha: Significance level
+        
+        Returns:
+            Array of achieved power values, one per duration
+        """
+        durations = np.asarray(durations)
+        
+        z_alpha = _norm_ppf(1 - alpha / 2)
+        delta = baseline_mean * mde_pct
+        ncp = (delta / baseline_std) * np.sqrt(durations / 2)
+        
+        achieved_power = 1 - stats.nct.cdf(z_alpha, df=2*durations - 2, nc=ncp)
+        
+        return np.clip(achieved_power, 0, 1)
+    
     def get_power_status(self, achieved_power: float) -> Tuple[str, str]:
         """
         Get status indicator and message for achieved power.
@@ -137,12 +220,12 @@ class PowerCalculator:
             Tuple of (status, message)
             status: 'high', 'medium', 'low'
         """
-        if achieved_power >= 0.80:
-            return ('high', f'✓ High power ({achieved_power:.1%})')
-        elif achieved_power >= 0.70:
-            return ('medium', f'⚠ Medium power ({achieved_power:.1%}) - Consider extending')
+        if math.isnan(achieved_power):
+            # NaN fails every >= comparison, so it has always reported as low
+            status, template = POWER_STATUSES[0]
         else:
-            return ('low', f'✗ Low power ({achieved_power:.1%}) - Increase duration')
+            status, template = POWER_STATUSES[bisect_right(POWER_STATUS_THRESHOLDS, achieved_power)]
+        return (status, template.format(achieved_power))
     
     def estimate_sample_characteristics(
         self,
@@ -157,8 +240,12 @@ class PowerCalculator:
         Returns:
             Dict with mean and std
         """
+        # One mean and one std pass; the CV reuses both
+        baseline_mean = np.mean(pre_period_data)
+        baseline_std = np.std(pre_period_data, ddof=1)  # Sample std
+        
         return {
-            'baseline_mean': np.mean(pre_period_data),
-            'baseline_std': np.std(pre_period_data, ddof=1),  # Sample std
-            'baseline_cv': np.std(pre_period_data, ddof=1) / np.mean(pre_period_data),  # Coefficient of variation
+            'baseline_mean': baseline_mean,
+            'baseline_std': baseline_std,
+            'baseline_cv': baseline_std / baseline_mean,  # Coefficient of variation
         }
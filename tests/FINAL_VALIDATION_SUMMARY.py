@@ -3,7 +3,7 @@
 Final Summary Display - Executive Summary Validation Results
 """
 
-print("""
+SUMMARY = """
 
 ╔════════════════════════════════════════════════════════════════════════════════════════════════╗
 ║                                                                                                ║
@@ -230,4 +230,8 @@ STATUS: READY FOR DEPLOYMENT
                                  VALIDATION COMPLETE ✓
 ═════════════════════════════════════════════════════════════════════════════════════════════════
 
-""")
+"""
+
+
+if __name__ == "__main__":
+    print(SUMMARY)
@@ -4,17 +4,37 @@ Comprehensive validation of Executive Summary metrics across 10 different experi
 Tests: effect sizes, p-values, z-scores, and decision framework logic.
 """
 
+import os
+
+# Scenarios run in parallel processes, so keep each one to a single BLAS/OpenMP
+# thread (must be set before numpy is imported)
+os.environ.setdefault('OMP_NUM_THREADS', '1')
+
+import multiprocessing
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from scipy.special import ndtr
 from causalimpact import CausalImpact
 from src.data_generator import StochasticSEOGenerator
 import warnings
 warnings.filterwarnings('ignore')
 
-print("="*100)
-print("EXECUTIVE SUMMARY VALIDATION TEST - 10 EXPERIMENTS WITH DIFFERENT SETTINGS")
-print("="*100)
+
+def nan_sum_mean_std(values):
+    """
+    NaN-ignoring sum, mean and (population) std of an array.
+    
+    Same results as np.nansum / np.nanmean / np.nanstd, but the NaNs are
+    dropped once and the mean is derived from the sum instead of three
+    separate NaN-aware reductions.
+    """
+    valid = values[~np.isnan(values)]
+    total = valid.sum()
+    mean = total / len(valid)
+    deviations = valid - mean
+    return total, mean, np.sqrt(deviations @ deviations / len(valid))
+
 
 # Define test scenarios: different templates, different effect sizes, different durations
 test_scenarios = [
@@ -34,17 +54,24 @@ test_scenarios = [
     {"template": "Content Expansion", "effect_pct": 0.09, "duration": 42, "seed": 5001},
 ]
 
-results = []
 
-for idx, scenario in enumerate(test_scenarios, 1):
-    print(f"\n{'='*100}")
-    print(f"EXPERIMENT {idx}/10: {scenario['template']} | Effect: {scenario['effect_pct']*100:.0f}% | Duration: {scenario['duration']}d")
-    print(f"{'='*100}")
+def run_scenario(scenario):
+    """
+    Generate one scenario, fit CausalImpact on it and compute its metrics.
+    
+    Runs in a worker process, so it only computes; printing happens in the
+    parent once every scenario is back.
+    
+    Returns:
+        Dict with the lines to report about the generated data, the
+        metrics, and 'error' set to a message (and no metrics) on failure
+    """
+    outcome = {'generated': [], 'error': None}
     
     try:
         # Initialize data generator
         data_gen = StochasticSEOGenerator(seed=scenario['seed'])
-        
+    
         # Generate experiment data
         result = data_gen.generate_experiment_data(
             test_market="Test_Market",
@@ -55,45 +82,48 @@ for idx, scenario in enumerate(test_scenarios, 1):
             effect_shape='step',
             confounders=None
         )
-        
+    
         data = result['data']
         metadata = result['metadata']
-        
-        print(f"✓ Generated data: {len(data)} days ({90} pre + {scenario['duration']} post)")
-        print(f"  Pre-period correlation: {metadata['control_correlation']:.3f}")
-        print(f"  Actual applied effect: {metadata['applied_effect_mde']:.1%}")
-        
-        # Prepare for CausalImpact
-        ci_data = data[['test_market', 'control_market']].copy()
-        ci_data.columns = ['y', 'X']
-        ci_data = ci_data.reset_index(drop=True)
-        
+        generated = outcome['generated']
+        generated.append(f"✓ Generated data: {len(data)} days ({90} pre + {scenario['duration']} post)")
+        generated.append(f"  Pre-period correlation: {metadata['control_correlation']:.3f}")
+        generated.append(f"  Actual applied effect: {metadata['applied_effect_mde']:.1%}")
+    
+        # Prepare for CausalImpact: built straight from the column arrays, so
+        # it already has a fresh RangeIndex and needs no copy/rename/reset
+        ci_data = pd.DataFrame({
+            'y': data['test_market'].to_numpy(),
+            'X': data['control_market'].to_numpy()
+        })
+    
         post_start = 90
-        
+    
         # Run CausalImpact
         ci = CausalImpact(
             ci_data,
             pre_period=[0, 89],
             post_period=[90, len(ci_data) - 1]
         )
-        
+    
         inferences = ci.inferences
-        actual_post = ci_data['y'].iloc[post_start:].values
-        predicted_post = inferences['preds'].iloc[post_start:].values
-        
+        # Slice NumPy views rather than going through pandas .iloc
+        actual_post = ci_data['y'].to_numpy()[post_start:]
+        predicted_post = inferences['preds'].to_numpy()[post_start:]
+    
         # Compute metrics (matching Executive Summary logic)
         pointwise_effects = actual_post - predicted_post
-        point_est = np.nansum(pointwise_effects)
-        avg_daily_effect = np.nanmean(pointwise_effects)
-        post_mean = actual_post.mean()
+        point_est, avg_daily_effect, effect_std = nan_sum_mean_std(pointwise_effects)
         post_sum = actual_post.sum()
+        post_mean = post_sum / len(actual_post)
         pct_effect = (point_est / post_sum * 100) if post_sum != 0 else 0
-        
+    
         # Statistical significance
-        effect_se = np.nanstd(pointwise_effects) / np.sqrt(len(pointwise_effects))
+        effect_se = effect_std / np.sqrt(len(pointwise_effects))
         z_score = point_est / effect_se if effect_se > 0 else 0
-        p_value = 2 * (1 - np.exp(-abs(z_score) / np.sqrt(2 * np.pi)))  # Approximation
-        
+        # Two-sided normal p-value, taken from the lower tail to avoid cancellation
+        p_value = 2 * ndtr(-abs(z_score))
+    
         # Decision framework
         if abs(pct_effect) > 5 and p_value < 0.05:
             decision = "✅ Ship"
@@ -101,66 +131,35 @@ for idx, scenario in enumerate(test_scenarios, 1):
             decision = "🔄 Continue"
         else:
             decision = "❌ Don't Ship"
-        
-        # Display results
-        print(f"\n📊 EXECUTIVE SUMMARY METRICS:")
-        print(f"  Estimated Effect: {point_est:+.0f} sessions ({pct_effect:+.1f}%)")
-        print(f"  Avg Daily Impact: {avg_daily_effect:+.0f} sessions ({(avg_daily_effect/post_mean*100):+.1f}%)")
-        print(f"  Post-Period Mean: {post_mean:+.0f} sessions")
-        print(f"  Z-Score: {z_score:.4f}")
-        print(f"  P-Value: {p_value:.6f}")
-        print(f"  → DECISION: {decision}")
-        
-        # Validation checks
-        print(f"\n✓ VALIDATION CHECKS:")
-        
-        # Check 1: Z-score reasonableness
-        if abs(z_score) > 100:
-            print(f"  ⚠️  WARNING: Z-score {z_score:.1f} is extremely high (typical range: ±3)")
-            print(f"      This can happen when effect is large, noise is small, or duration is very long")
-        elif abs(z_score) > 3:
-            print(f"  ✓ Z-score {z_score:.2f} is large but plausible (high statistical power)")
-        elif abs(z_score) > 0:
-            print(f"  ✓ Z-score {z_score:.2f} is reasonable (moderate power)")
-        else:
-            print(f"  ✓ Z-score {z_score:.2f} indicates weak evidence (low power)")
-        
-        # Check 2: Effect size consistency
-        requested_effect = scenario['effect_pct']
-        observed_effect = pct_effect / 100
-        consistency = observed_effect / requested_effect
-        if 0.7 < consistency < 1.3:
-            print(f"  ✓ Effect size consistency: {consistency:.2f}x (requested {requested_effect*100:.0f}%, observed {pct_effect:.1f}%)")
-        else:
-            print(f"  ⚠️  Effect size divergence: {consistency:.2f}x (requested {requested_effect*100:.0f}%, observed {pct_effect:.1f}%)")
-        
-        # Check 3: P-value vs Decision alignment
-        if decision == "✅ Ship" and p_value < 0.05:
-            print(f"  ✓ Decision-p-value alignment: Ship decision with p={p_value:.6f} < 0.05 ✓")
-        elif decision == "🔄 Continue" and p_value < 0.10:
-            print(f"  ✓ Decision-p-value alignment: Continue decision with p={p_value:.6f} < 0.10 ✓")
-        elif decision == "❌ Don't Ship":
-            print(f"  ✓ Decision-p-value alignment: Don't Ship decision (p={p_value:.6f} >= thresholds)")
-        
-        # Check 4: Standard error sanity
-        print(f"  ✓ Standard Error: {effect_se:.1f} sessions (mean post-period: {post_mean:.0f})")
-        print(f"    → Effect/SE ratio (z-score): {z_score:.2f}")
-        
-        results.append({
-            'Exp': idx,
-            'Template': scenario['template'][:20],
-            'Requested': f"{scenario['effect_pct']*100:.0f}%",
-            'Observed': f"{pct_effect:+.1f}%",
-            'Effect_Sessions': f"{point_est:+.0f}",
-            'Z_Score': f"{z_score:.2f}",
-            'P_Value': f"{p_value:.6f}",
-            'Decision': decision,
-            'Status': '✓' if decision in ["✅ Ship", "🔄 Continue"] else '—'
-        })
-        
     except Exception as e:
-        print(f"✗ ERROR: {str(e)[:80]}")
-        results.append({
+        outcome['error'] = str(e)[:80]
+        return outcome
+    
+    outcome.update({
+        'point_est': point_est,
+        'avg_daily_effect': avg_daily_effect,
+        'post_mean': post_mean,
+        'pct_effect': pct_effect,
+        'effect_se': effect_se,
+        'z_score': z_score,
+        'p_value': p_value,
+        'decision': decision
+    })
+    return outcome
+    
+
+def report_scenario(idx, scenario, outcome):
+    """Print one scenario's metrics and validation checks; return its summary table row."""
+    print(f"\n{'='*100}")
+    print(f"EXPERIMENT {idx}/10: {scenario['template']} | Effect: {scenario['effect_pct']*100:.0f}% | Duration: {scenario['duration']}d")
+    print(f"{'='*100}")
+    
+    for line in outcome['generated']:
+        print(line)
+    
+    if outcome['error'] is not None:
+        print(f"✗ ERROR: {outcome['error']}")
+        return {
             'Exp': idx,
             'Template': scenario['template'][:20],
             'Requested': f"{scenario['effect_pct']*100:.0f}%",
@@ -170,110 +169,185 @@ for idx, scenario in enumerate(test_scenarios, 1):
             'P_Value': "N/A",
             'Decision': "❌ ERROR",
             'Status': '✗'
-        })
+        }
+    
+    point_est = outcome['point_est']
+    avg_daily_effect = outcome['avg_daily_effect']
+    post_mean = outcome['post_mean']
+    pct_effect = outcome['pct_effect']
+    effect_se = outcome['effect_se']
+    z_score = outcome['z_score']
+    p_value = outcome['p_value']
+    decision = outcome['decision']
+    
+    # Display results
+    print(f"\n📊 EXECUTIVE SUMMARY METRICS:")
+    print(f"  Estimated Effect: {point_est:+.0f} sessions ({pct_effect:+.1f}%)")
+    print(f"  Avg Daily Impact: {avg_daily_effect:+.0f} sessions ({(avg_daily_effect/post_mean*100):+.1f}%)")
+    print(f"  Post-Period Mean: {post_mean:+.0f} sessions")
+    print(f"  Z-Score: {z_score:.4f}")
+    print(f"  P-Value: {p_value:.6f}")
+    print(f"  → DECISION: {decision}")
+
+    # Validation checks
+    print(f"\n✓ VALIDATION CHECKS:")
+
+    # Check 1: Z-score reasonableness
+    if abs(z_score) > 100:
+        print(f"  ⚠️  WARNING: Z-score {z_score:.1f} is extremely high (typical range: ±3)")
+        print(f"      This can happen when effect is large, noise is small, or duration is very long")
+    elif abs(z_score) > 3:
+        print(f"  ✓ Z-score {z_score:.2f} is large but plausible (high statistical power)")
+    elif abs(z_score) > 0:
+        print(f"  ✓ Z-score {z_score:.2f} is reasonable (moderate power)")
+    else:
+        print(f"  ✓ Z-score {z_score:.2f} indicates weak evidence (low power)")
+
+    # Check 2: Effect size consistency
+    requested_effect = scenario['effect_pct']
+    observed_effect = pct_effect / 100
+    consistency = observed_effect / requested_effect
+    if 0.7 < consistency < 1.3:
+        print(f"  ✓ Effect size consistency: {consistency:.2f}x (requested {requested_effect*100:.0f}%, observed {pct_effect:.1f}%)")
+    else:
+        print(f"  ⚠️  Effect size divergence: {consistency:.2f}x (requested {requested_effect*100:.0f}%, observed {pct_effect:.1f}%)")
+
+    # Check 3: P-value vs Decision alignment
+    if decision == "✅ Ship" and p_value < 0.05:
+        print(f"  ✓ Decision-p-value alignment: Ship decision with p={p_value:.6f} < 0.05 ✓")
+    elif decision == "🔄 Continue" and p_value < 0.10:
+        print(f"  ✓ Decision-p-value alignment: Continue decision with p={p_value:.6f} < 0.10 ✓")
+    elif decision == "❌ Don't Ship":
+        print(f"  ✓ Decision-p-value alignment: Don't Ship decision (p={p_value:.6f} >= thresholds)")
+
+    # Check 4: Standard error sanity
+    print(f"  ✓ Standard Error: {effect_se:.1f} sessions (mean post-period: {post_mean:.0f})")
+    print(f"    → Effect/SE ratio (z-score): {z_score:.2f}")
+
+    
+    return {
+            'Exp': idx,
+            'Template': scenario['template'][:20],
+            'Requested': f"{scenario['effect_pct']*100:.0f}%",
+            'Observed': f"{pct_effect:+.1f}%",
+            'Effect_Sessions': f"{point_est:+.0f}",
+            'Z_Score': f"{z_score:.2f}",
+            'P_Value': f"{p_value:.6f}",
+            'Decision': decision,
+            'Status': '✓' if decision in ["✅ Ship", "🔄 Continue"] else '—'
+        }
+
 
-# Display summary table
-print(f"\n\n{'='*100}")
-print("SUMMARY TABLE - ALL 10 EXPERIMENTS")
-print(f"{'='*100}\n")
-
-results_df = pd.DataFrame(results)
-print(results_df.to_string(index=False))
-
-# Analysis summary
-print(f"\n\n{'='*100}")
-print("KEY FINDINGS & INTERPRETATION")
-print(f"{'='*100}")
-
-successful_runs = sum(1 for r in results if r['Status'] == '✓')
-print(f"\n1. SUCCESS RATE: {successful_runs}/10 experiments completed successfully")
-
-# Z-score analysis
-z_scores = []
-for r in results:
-    if r['Z_Score'] != "N/A":
-        try:
-            z = float(r['Z_Score'])
-            z_scores.append(z)
-        except:
-            pass
-
-if z_scores:
-    print(f"\n2. Z-SCORE ANALYSIS:")
-    print(f"   Mean: {np.mean(z_scores):.2f}")
-    print(f"   Min: {min(z_scores):.2f} | Max: {max(z_scores):.2f}")
-    print(f"   Typical range for statistical tests: ±3 (very strong evidence)")
-    print(f"   High z-scores expected when:")
-    print(f"     - Effect size is large (>10%)")
-    print(f"     - Duration is long (>40 days)")
-    print(f"     - Baseline noise is low (high correlation control)")
-
-# P-value analysis
-print(f"\n3. P-VALUE CLARIFICATION:")
-print(f"   Q: Is the p-value in Executive Summary linked to the p-value in Experiment Design?")
-print(f"   A: NO, they are DIFFERENT:")
-print(f"")
-print(f"   EXPERIMENT DESIGN p-value (Page 2):")
-print(f"   - This is a TARGET p-value (significance level)")
-print(f"   - Used in power analysis to calculate required sample size")
-print(f"   - Example: 'We want p < 0.05, so we need 90 days of data'")
-print(f"")
-print(f"   EXECUTIVE SUMMARY p-value (Page 5):")
-print(f"   - This is an OBSERVED p-value from the actual experiment")
-print(f"   - Computed from: z_score = effect / standard_error")
-print(f"   - Then: p_value = 2 * (1 - Φ(|z|)) where Φ is the normal CDF")
-print(f"   - This p-value tells you: 'How rare is this result by chance?'")
-print(f"")
-print(f"   DECISION FRAMEWORK uses OBSERVED p-value:")
-print(f"   - Ship if: effect > 5% AND p < 0.05")
-print(f"   - Continue if: effect > 2% AND p < 0.10")
-print(f"   - Don't Ship if: neither condition met")
-
-# Reasonableness check
-print(f"\n4. REASONABLENESS ASSESSMENT:")
-
-# Count decision distribution
-decisions = [r['Decision'] for r in results if r['Decision'] != "❌ ERROR"]
-ship_count = sum(1 for d in decisions if d == "✅ Ship")
-continue_count = sum(1 for d in decisions if d == "🔄 Continue")
-no_ship_count = sum(1 for d in decisions if d == "❌ Don't Ship")
-
-print(f"   Decision Distribution:")
-print(f"   - Ship: {ship_count} experiments (effect > 5%, p < 0.05)")
-print(f"   - Continue: {continue_count} experiments (effect > 2%, p < 0.10)")
-print(f"   - Don't Ship: {no_ship_count} experiments")
-print(f"")
-print(f"   This distribution MAKES SENSE because:")
-print(f"   - Larger requested effects (10%+) tend to be 'Ship'")
-print(f"   - Medium effects (5-10%) tend to be 'Continue'")
-print(f"   - Small effects (2-5%) are borderline")
-print(f"   - Very small effects (<2%) are 'Don't Ship'")
-
-# Z-score sanity
-if z_scores and max(abs(np.array(z_scores))) > 100:
-    print(f"\n5. HIGH Z-SCORE INVESTIGATION:")
-    print(f"   Found z-scores > 100. This is NORMAL when:")
-    print(f"   - Requested effect is VERY LARGE (e.g., 20%)")
-    print(f"   - Experiment duration is LONG (e.g., 56 days)")
-    print(f"   - Control correlation is STRONG (e.g., 0.92+)")
+if __name__ == '__main__':
+    print("="*100)
+    print("EXECUTIVE SUMMARY VALIDATION TEST - 10 EXPERIMENTS WITH DIFFERENT SETTINGS")
+    print("="*100)
+
+    # Each fit is independent, so run them across processes; map() keeps
+    # scenario order for the report
+    with multiprocessing.Pool(processes=min(len(test_scenarios), os.cpu_count() or 1)) as pool:
+        outcomes = pool.map(run_scenario, test_scenarios)
+
+    results = [
+        report_scenario(idx, scenario, outcome)
+        for idx, (scenario, outcome) in enumerate(zip(test_scenarios, outcomes), 1)
+    ]
+
+    # Display summary table
+    print(f"\n\n{'='*100}")
+    print("SUMMARY TABLE - ALL 10 EXPERIMENTS")
+    print(f"{'='*100}\n")
+
+    results_df = pd.DataFrame(results)
+    print(results_df.to_string(index=False))
+
+    # Analysis summary
+    print(f"\n\n{'='*100}")
+    print("KEY FINDINGS & INTERPRETATION")
+    print(f"{'='*100}")
+
+    successful_runs = int((results_df['Status'] == '✓').sum())
+    print(f"\n1. SUCCESS RATE: {successful_runs}/10 experiments completed successfully")
+
+    # Z-score analysis, on the raw values rather than the formatted table
+    z_scores = np.array([o['z_score'] for o in outcomes if o['error'] is None], dtype=np.float64)
+
+    if z_scores.size:
+        print(f"\n2. Z-SCORE ANALYSIS:")
+        print(f"   Mean: {z_scores.mean():.2f}")
+        print(f"   Min: {z_scores.min():.2f} | Max: {z_scores.max():.2f}")
+        print(f"   Typical range for statistical tests: ±3 (very strong evidence)")
+        print(f"   High z-scores expected when:")
+        print(f"     - Effect size is large (>10%)")
+        print(f"     - Duration is long (>40 days)")
+        print(f"     - Baseline noise is low (high correlation control)")
+
+    # P-value analysis
+    print(f"\n3. P-VALUE CLARIFICATION:")
+    print(f"   Q: Is the p-value in Executive Summary linked to the p-value in Experiment Design?")
+    print(f"   A: NO, they are DIFFERENT:")
     print(f"")
-    print(f"   In real SEO tests, z > 100 is rare because:")
-    print(f"   - True effects are usually 2-10%")
-    print(f"   - Market noise is typically high")
-    print(f"   - Test duration is usually 4-6 weeks")
+    print(f"   EXPERIMENT DESIGN p-value (Page 2):")
+    print(f"   - This is a TARGET p-value (significance level)")
+    print(f"   - Used in power analysis to calculate required sample size")
+    print(f"   - Example: 'We want p < 0.05, so we need 90 days of data'")
     print(f"")
-    print(f"   In this simulator, high z-scores are EXPECTED because:")
-    print(f"   - We control noise (reproducible synthetic data)")
-    print(f"   - We test with unrealistically large effects (15-20%)")
-    print(f"   - These conditions create very high statistical power")
-
-print(f"\n{'='*100}")
-print("CONCLUSION")
-print(f"{'='*100}")
-print(f"\n✓ Executive Summary metrics are WORKING CORRECTLY")
-print(f"\n✓ Z-scores and p-values are MATHEMATICALLY SOUND")
-print(f"  (High z-scores occur when effect size is large relative to noise)")
-print(f"\n✓ Decision framework LOGIC is CONSISTENT with the data")
-print(f"\n✓ Results IMPROVE with larger effects and longer durations")
-print(f"\n→ The Executive Summary page is PRODUCTION-READY for job applications")
-print(f"\n" + "="*100)
+    print(f"   EXECUTIVE SUMMARY p-value (Page 5):")
+    print(f"   - This is an OBSERVED p-value from the actual experiment")
+    print(f"   - Computed from: z_score = effect / standard_error")
+    print(f"   - Then: p_value = 2 * (1 - Φ(|z|)) where Φ is the normal CDF")
+    print(f"   - This p-value tells you: 'How rare is this result by chance?'")
+    print(f"")
+    print(f"   DECISION FRAMEWORK uses OBSERVED p-value:")
+    print(f"   - Ship if: effect > 5% AND p < 0.05")
+    print(f"   - Continue if: effect > 2% AND p < 0.10")
+    print(f"   - Don't Ship if: neither condition met")
+
+    # Reasonableness check
+    print(f"\n4. REASONABLENESS ASSESSMENT:")
+
+    # Count decision distribution
+    decision_counts = results_df['Decision'].value_counts()
+    ship_count = decision_counts.get("✅ Ship", 0)
+    continue_count = decision_counts.get("🔄 Continue", 0)
+    no_ship_count = decision_counts.get("❌ Don't Ship", 0)
+
+    print(f"   Decision Distribution:")
+    print(f"   - Ship: {ship_count} experiments (effect > 5%, p < 0.05)")
+    print(f"   - Continue: {continue_count} experiments (effect > 2%, p < 0.10)")
+    print(f"   - Don't Ship: {no_ship_count} experiments")
+    print(f"")
+    print(f"   This distribution MAKES SENSE because:")
+    print(f"   - Larger requested effects (10%+) tend to be 'Ship'")
+    print(f"   - Medium effects (5-10%) tend to be 'Continue'")
+    print(f"   - Small effects (2-5%) are borderline")
+    print(f"   - Very small effects (<2%) are 'Don't Ship'")
+
+    # Z-score sanity
+    if z_scores.size and np.abs(z_scores).max() > 100:
+        print(f"\n5. HIGH Z-SCORE INVESTIGATION:")
+        print(f"   Found z-scores > 100. This is NORMAL when:")
+        print(f"   - Requested effect is VERY LARGE (e.g., 20%)")
+        print(f"   - Experiment duration is LONG (e.g., 56 days)")
+        print(f"   - Control correlation is STRONG (e.g., 0.92+)")
+        print(f"")
+        print(f"   In real SEO tests, z > 100 is rare because:")
+        print(f"   - True effects are usually 2-10%")
+        print(f"   - Market noise is typically high")
+        print(f"   - Test duration is usually 4-6 weeks")
+        print(f"")
+        print(f"   In this simulator, high z-scores are EXPECTED because:")
+        print(f"   - We control noise (reproducible synthetic data)")
+        print(f"   - We test with unrealistically large effects (15-20%)")
+        print(f"   - These conditions create very high statistical power")
+
+    print(f"\n{'='*100}")
+    print("CONCLUSION")
+    print(f"{'='*100}")
+    print(f"\n✓ Executive Summary metrics are WORKING CORRECTLY")
+    print(f"\n✓ Z-scores and p-values are MATHEMATICALLY SOUND")
+    print(f"  (High z-scores occur when effect size is large relative to noise)")
+    print(f"\n✓ Decision framework LOGIC is CONSISTENT with the data")
+    print(f"\n✓ Results IMPROVE with larger effects and longer durations")
+    print(f"\n→ The Executive Summary page is PRODUCTION-READY for job applications")
+    print(f"\n" + "="*100)